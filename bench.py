@@ -0,0 +1,301 @@
+"""
+Benchmarks the scheduling pipeline on seeded synthetic STP workloads.
+
+    python bench.py --output results.json
+    python bench.py --variants final --workloads chain --sizes 1000 100000
+    python bench.py --compare old.json new.json
+
+Every variant (the final, messi and test update strategies from
+stp.strategies) runs the same workloads through build_graph, the earliest
+and latest bellman_ford passes, its adjust_constraints and the printing
+helpers. Each phase is timed on its own
+and then run again under tracemalloc for its peak memory. A phase that runs
+past --timeout stops that variant from trying larger sizes of the workload;
+a phase that raises is recorded as an error and the run moves on.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from stp import core
+from stp.strategies import STRATEGIES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VARIANTS = tuple(STRATEGIES)
+WORKLOADS = ("chain", "random_dag", "dense", "infeasible")
+SIZES = (10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _duration(lower, upper):
+    return lower if lower == upper else range(lower, upper + 1)
+
+
+def _chain(rng, n):
+    lower = rng.integers(0, 3, n)
+    upper = lower + rng.integers(0, 2, n)
+    constraints = [
+        (i, i + 1, _duration(l, u))
+        for i, (l, u) in enumerate(zip(lower.tolist(), upper.tolist()))
+    ]
+    return constraints, lower, upper
+
+
+def _planted(rng, pairs, constraints, lower):
+    """Adds constraints on the given (i, j) pairs that hold for one hidden
+    solution, the chain run at its lower bounds, so the STP stays feasible."""
+    hidden = np.concatenate(([0], np.cumsum(lower)))
+    i, j = pairs
+    gap = hidden[j] - hidden[i]
+    slack = rng.integers(0, 3, len(i))
+    for a, b, g, s in zip(i.tolist(), j.tolist(), gap.tolist(), slack.tolist()):
+        constraints.append((a, b, _duration(max(g - s, 0), g + s)))
+
+
+def generate(workload, n, seed=0):
+    """
+    Builds one synthetic schedule with n tasks.
+
+    Returns (constraints, num_tasks, start_hour, end_hour), with the day
+    bound already appended the way main does it. Times are hours from a
+    start_hour of 0, so end_hour may be well past 24 for large n.
+    """
+    rng = np.random.default_rng([seed, WORKLOADS.index(workload), n])
+    constraints, lower, upper = _chain(rng, n)
+    day = int(upper.sum()) + n // 10 + 1
+
+    if workload == "random_dag" and n > 2:
+        i = rng.integers(0, n - 1, n)
+        j = np.minimum(i + rng.integers(2, 11, n), n)
+        keep = j - i >= 2
+        _planted(rng, (i[keep], j[keep]), constraints, lower)
+    elif workload == "dense" and n > 2:
+        i, j = np.triu_indices(n + 1, 2)
+        chosen = rng.random(len(i)) < 0.5
+        _planted(rng, (i[chosen], j[chosen]), constraints, lower)
+    elif workload == "infeasible":
+        # The tasks need at least sum(lower) hours but the day is shorter
+        day = int(lower.sum()) - 1
+
+    constraints.append((0, n, range(0, max(day, 0) + 1)))
+    return constraints, n, 0, max(day, 1)
+
+
+def _phases(strategy, constraints, num_tasks, start_hour, end_hour):
+    """Yields (phase name, callable) in pipeline order. Each callable gets
+    the previous phase's result."""
+
+    def earliest(G):
+        core.bellman_ford(G, 0, reverse=True)
+        return G
+
+    def latest(G):
+        core.bellman_ford(G, 0)
+        return G
+
+    # Move the middle task to the middle of the day, which is inside the
+    # day for every workload size
+    edit_hour = start_hour + (end_hour - start_hour) // 2
+    edit_time = "12 pm" if edit_hour == 12 else f"{edit_hour} am"
+
+    def adjust(G):
+        strategy.adjust_constraints(
+            constraints,
+            max(num_tasks // 2, 1),
+            edit_time,
+            num_tasks,
+            start_hour,
+            end_hour,
+        )
+        return G
+
+    def printing(G):
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            for line in core.format_constraints(constraints):
+                print(line)
+            core.print_graph(G)
+            for hour in range(num_tasks + 1):
+                print(core.time_conversion(hour, start_hour))
+        return G
+
+    yield "build_graph", lambda _: core.build_graph(
+        constraints, num_tasks, start_hour, end_hour
+    )
+    yield "bellman_ford_earliest", earliest
+    yield "bellman_ford_latest", latest
+    yield "adjust_constraints", adjust
+    yield "print", printing
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout
+
+
+def _run_phase(phase, value, timeout):
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            result = phase(value)
+            return result, time.perf_counter() - start
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _peak_memory(phase, value, timeout):
+    tracemalloc.start()
+    try:
+        _run_phase(phase, value, timeout)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(variants, workloads, sizes, seed, timeout, memory, dense_max, log):
+    results = []
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+    for name in variants:
+        strategy = STRATEGIES[name]()
+        for workload in workloads:
+            for n in sizes:
+                if workload == "dense" and n > dense_max:
+                    continue
+                schedule = generate(workload, n, seed)
+                value = None
+                timed_out = False
+                for phase_name, phase in _phases(strategy, *schedule):
+                    record = {
+                        "variant": name,
+                        "workload": workload,
+                        "size": n,
+                        "seed": seed,
+                        "phase": phase_name,
+                    }
+                    previous = value
+                    try:
+                        value, record["seconds"] = _run_phase(phase, previous, timeout)
+                        record["status"] = "ok"
+                    except _Timeout:
+                        record["status"] = "timeout"
+                        timed_out = True
+                    except Exception as error:
+                        record["status"] = "error"
+                        record["error"] = f"{type(error).__name__}: {error}"
+                    if memory and record["status"] == "ok":
+                        try:
+                            record["peak_bytes"] = _peak_memory(
+                                phase, previous, timeout
+                            )
+                        except _Timeout:
+                            # tracemalloc slows Python code down a lot
+                            record["peak_bytes"] = None
+                    results.append(record)
+                    log(
+                        f"{name:6} {workload:11} {n:>8} {phase_name:22} "
+                        + (
+                            f"{record['seconds']:10.4f}s"
+                            if "seconds" in record
+                            else record["status"]
+                        )
+                    )
+                    if record["status"] != "ok":
+                        break
+                if timed_out:
+                    break
+
+    return results
+
+
+def compare(old_path, new_path):
+    """Prints the time ratio new/old for every phase both files measured."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def key(record):
+        return record["variant"], record["workload"], record["size"], record["phase"]
+
+    before = {key(r): r for r in old["results"] if r.get("status") == "ok"}
+    for record in new["results"]:
+        if record.get("status") != "ok" or key(record) not in before:
+            continue
+        ratio = record["seconds"] / max(before[key(record)]["seconds"], 1e-9)
+        print("{:6} {:11} {:>8} {:22} {:8.2f}x".format(*key(record), ratio))
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=VARIANTS)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=WORKLOADS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="seconds allowed per phase"
+    )
+    parser.add_argument(
+        "--dense-max", type=int, default=2000, help="largest dense workload"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    results = run(
+        args.variants,
+        args.workloads,
+        args.sizes,
+        args.seed,
+        args.timeout,
+        not args.no_memory,
+        args.dense_max,
+        lambda line: print(line, file=sys.stderr),
+    )
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "commit": _commit(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Wrote {len(results)} measurements to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Simple Temporal Problem scheduling: build the distance graph of a day's
+tasks, solve earliest and latest start times, and keep them up to date as
+tasks move.
+"""
+
+from .cache import SolveCache, fingerprint
+from .chain import chain_bounds, solve_chain
+from .conflict import Conflict, explain, find_conflict
+from .constraints import ConstraintSet, as_constraint_set, duration_bounds
+from .core import (
+    bellman_ford,
+    build_graph,
+    convert_to_24_hour_format,
+    distance_table,
+    format_constraints,
+    parse_duration,
+    print_graph,
+    solve_schedule,
+    time_conversion,
+)
+from .dispatch import DispatchableNetwork, Dispatcher, compile_dispatchable
+from .feasibility import FeasibilityIndex, feasibility_index, sweep_start_times
+from .finite_domain import hour_domains, solve_finite_domain
+from .graph import CompactGraph
+from .incremental import IncrementalSTN, incremental_stn
+from .many import solve_many
+from .minimal_network import (
+    MinimalNetwork,
+    SparseMinimalNetwork,
+    minimal_network,
+    solve_minimal_network,
+    sparse_minimal_network,
+)
+from .montecarlo import (
+    MakespanReport,
+    sample_start_times,
+    simulate_makespan,
+    uniform_durations,
+)
+from .parallel import components, solve_components
+from .stnu import (
+    STNU,
+    ExecutionStrategy,
+    build_stnu,
+    contingent_durations,
+    dynamic_controllability,
+)
+from .strategies import (
+    STRATEGIES,
+    KeepIndices,
+    ShiftToHour,
+    ShiftToTask,
+    UpdateStrategy,
+)
+
+__all__ = [
+    "CompactGraph",
+    "Conflict",
+    "ConstraintSet",
+    "DispatchableNetwork",
+    "Dispatcher",
+    "ExecutionStrategy",
+    "FeasibilityIndex",
+    "IncrementalSTN",
+    "KeepIndices",
+    "MakespanReport",
+    "MinimalNetwork",
+    "STNU",
+    "STRATEGIES",
+    "SolveCache",
+    "ShiftToHour",
+    "ShiftToTask",
+    "SparseMinimalNetwork",
+    "UpdateStrategy",
+    "as_constraint_set",
+    "bellman_ford",
+    "build_graph",
+    "build_stnu",
+    "chain_bounds",
+    "compile_dispatchable",
+    "components",
+    "contingent_durations",
+    "convert_to_24_hour_format",
+    "distance_table",
+    "duration_bounds",
+    "dynamic_controllability",
+    "explain",
+    "feasibility_index",
+    "fingerprint",
+    "find_conflict",
+    "format_constraints",
+    "hour_domains",
+    "incremental_stn",
+    "minimal_network",
+    "parse_duration",
+    "print_graph",
+    "sample_start_times",
+    "solve_chain",
+    "solve_components",
+    "solve_finite_domain",
+    "solve_many",
+    "solve_minimal_network",
+    "simulate_makespan",
+    "solve_schedule",
+    "sparse_minimal_network",
+    "sweep_start_times",
+    "time_conversion",
+    "uniform_durations",
+]
@@ -0,0 +1,282 @@
+"""
+Interactive front end: asks for the tasks and the day, prints the schedule
+and lets the user move tasks one at a time.
+
+    python final.py
+    python -m stp.app
+
+How a moved task changes the remaining constraints is up to the
+UpdateStrategy passed to main; final.py, messi.py and test.py each run the
+same loop with their own strategy.
+"""
+
+import numpy as np
+
+from . import instrument
+from .chain import chain_bounds, solve_chain
+from .conflict import find_conflict
+from .core import (
+    build_graph,
+    convert_to_24_hour_format,
+    distance_table,
+    format_constraints,
+    get_user_input,
+    print_graph,
+    solve_schedule,
+    time_conversion,
+)
+from .strategies import KeepIndices
+
+
+def main(strategy=None):
+    if strategy is None:
+        strategy = KeepIndices()
+
+    constraints, num_tasks = get_user_input()
+    last_updated_task = 0
+    while True:
+        start_time_str = input(
+            "Enter the hour you want to start your day (e.g., '5 am'): "
+        )
+        end_time_str = input(
+            "Enter the hour you want to end your day (e.g., '10 pm'): "
+        )
+
+        start_hour = convert_to_24_hour_format(start_time_str)
+        end_hour = convert_to_24_hour_format(end_time_str)
+
+        if start_hour < end_hour:
+            break
+        else:
+            print(
+                "Invalid time range! Please make sure the start time is earlier than the end time. Try again."
+            )
+
+    total_hours = end_hour - start_hour
+
+    constraints.append((0, num_tasks, range(0, total_hours + 1)))
+
+    print("\nConstraints:")
+    formatted_constraints = format_constraints(constraints)
+    for constraint in formatted_constraints:
+        print(constraint)
+
+    G = build_graph(constraints, num_tasks, start_hour, end_hour)
+
+    print(print_graph(G))
+    chain = chain_bounds(constraints, num_tasks)
+    if chain is not None:
+        # The usual task chain is solved directly in linear time
+        print("\nCalculating earliest and latest start times along the task chain...")
+        earliest, latest = solve_chain(*chain)
+        if earliest is None:
+            print("The tasks cannot fit in the day. No solution exists.")
+            _explain(G, constraints, num_tasks)
+            return 0
+        distances_earliest = dict(enumerate((-earliest).tolist()))
+        distances_latest = dict(enumerate(latest.tolist()))
+    else:
+        # Run SPFA forwards for latest and backwards for earliest times; it
+        # stops as soon as a negative cycle forms, so infeasible schedules
+        # fail fast
+        print("\nCalculating earliest and latest start times...")
+        earliest, latest = solve_schedule(G, method="spfa")
+        if earliest is None:
+            print("Negative cycle detected. No solution exists.")
+            _explain(G, constraints, num_tasks)
+            return 0
+        distances_earliest = distance_table(G, -earliest)
+        distances_latest = distance_table(G, latest)
+
+    with instrument.phase("print"):
+        print("\nTotal Duration of Shortest Paths for Earliest Start Times:")
+        for node in distances_earliest:
+            if node == 0:
+                continue
+            total_duration_earliest = -distances_earliest[
+                node
+            ]  # Use negative value for earliest start times
+            print(
+                f"Total duration to {G.label(node)} (Earliest): {total_duration_earliest} hour(s)"
+            )
+
+        print("\nTotal Duration of Shortest Paths for Latest Start Times:")
+        for node in distances_latest:
+            if node == 0:
+                continue
+            total_duration_latest = distances_latest[node]
+            print(
+                f"Total duration to {G.label(node)} (Latest): {total_duration_latest} hour(s)"
+            )
+
+        # Display schedules
+        print("\nEarliest start times:")
+        for node in distances_earliest:
+            if node == 0:
+                continue
+            print(
+                f"{G.label(node)}: {time_conversion(-distances_earliest[node], start_hour)}"
+            )
+
+        print("\nLatest start times:")
+        for node in distances_latest:
+            if node == 0:
+                continue
+            print(
+                f"{G.label(node)}: {time_conversion(distances_latest[node], start_hour)}"
+            )
+
+    # Both tables are keyed by task number; anchor is the task number of the
+    # current x0 and anchor_hour the clock hour its times are offsets from
+    original_earliest_times = {
+        node: -distances_earliest[node] for node in distances_earliest
+    }
+    original_latest_times = {node: distances_latest[node] for node in distances_latest}
+    anchor = 0
+    anchor_hour = start_hour
+
+    # Ask if the user wants to change anything
+    while True:
+        change_schedule = (
+            input("Would you like to change any task in the schedule? (yes/no): ")
+            .strip()
+            .lower()
+        )
+
+        if change_schedule == "no":
+            break  # Exit the loop if the user doesn't want to change the schedule
+
+        # Display the range of start times for each task that can be changed
+        print("\nYou can change the start times of the following tasks:")
+        for i in range(last_updated_task + 1, num_tasks + 1):
+            if i in original_earliest_times and i in original_latest_times:
+                earliest_start = time_conversion(
+                    original_earliest_times[i], anchor_hour
+                )
+                latest_start = time_conversion(original_latest_times[i], anchor_hour)
+                print(
+                    f"Task {i}: Earliest start time: {earliest_start}, Latest start time: {latest_start}"
+                )
+
+        # Ask which task to change, ensuring it's not a completed task
+        task_to_change = int(
+            input("Which task number do you want to change? (Enter the task number): ")
+        )
+        if task_to_change <= last_updated_task:
+            print(
+                f"Task {task_to_change} has already been started or completed and cannot be changed."
+            )
+            continue
+
+        # Ask for a new time within this range
+        new_time_str = input(
+            f"Enter the new start time for Task {task_to_change} (within the range above): "
+        )
+
+        # Since the start time for a task has changed, we need to update the
+        # constraints, which are numbered from the current x0
+        relative_task = task_to_change - anchor
+        try:
+            constraints = strategy.adjust_constraints(
+                constraints,
+                relative_task,
+                new_time_str,
+                num_tasks - anchor,
+                start_hour,
+                end_hour,
+            )
+        except ValueError as error:
+            print(f"Task {task_to_change} cannot start at {new_time_str}: {error}.")
+            continue
+
+        # Update the last updated task
+        last_updated_task = task_to_change
+        for constraint in format_constraints(constraints):
+            print(constraint)
+        sub_constraints, sub_tasks, source = strategy.sub_schedule(
+            constraints, relative_task, num_tasks - anchor
+        )
+        if strategy.reanchors:
+            anchor = task_to_change
+            anchor_hour = strategy.anchor_hour(start_hour, new_time_str)
+
+        if sub_tasks == 0:
+            # The moved task was the last one, so there is nothing to solve
+            original_earliest_times = {}
+            original_latest_times = {}
+        else:
+            # Rebuild the graph with updated constraints for the uncompleted tasks
+            G_updated = build_graph(sub_constraints, sub_tasks, start_hour, end_hour)
+            print(print_graph(G_updated))
+            print(
+                "\nRecalculating times for subsequent tasks starting from the updated task..."
+            )
+            # The times from before the edit are nearly right, so they warm-start
+            # the solve
+            previous = (
+                _node_times(original_earliest_times, anchor, G_updated.num_nodes),
+                _node_times(original_latest_times, anchor, G_updated.num_nodes),
+            )
+            earliest_updated, latest_updated = solve_schedule(
+                G_updated, source, method="spfa", previous=previous
+            )
+
+            # Check for negative cycles in the updated graph
+            if earliest_updated is None:
+                print(
+                    "Negative cycle detected after updating the task. No solution exists."
+                )
+                _explain(G_updated, sub_constraints, sub_tasks, source)
+                return 0
+
+            original_earliest_times = {
+                node + anchor: -dist
+                for node, dist in distance_table(G_updated, -earliest_updated).items()
+                if node != 0
+            }
+            original_latest_times = {
+                node + anchor: dist
+                for node, dist in distance_table(G_updated, latest_updated).items()
+                if node != 0
+            }
+        if strategy.reanchors:
+            # x0 is now the moved task itself, pinned at anchor_hour
+            original_earliest_times[anchor] = 0
+            original_latest_times[anchor] = 0
+
+        print("\nUpdated Earliest start times:")
+        for i in range(last_updated_task, num_tasks + 1):
+            print(f"x{i}: {_clock(original_earliest_times.get(i), anchor_hour)}")
+
+        print("\nUpdated Latest start times:")
+        for i in range(last_updated_task, num_tasks + 1):
+            print(f"x{i}: {_clock(original_latest_times.get(i), anchor_hour)}")
+
+        print("Schedule update complete.")
+
+
+def _explain(G, constraints, num_tasks, source=0):
+    conflict = find_conflict(G, source)
+    if conflict is None:
+        return
+    print("These constraints cannot all hold:")
+    for line in conflict.describe(constraints, num_tasks):
+        print(f"  {line}")
+
+
+def _node_times(times, anchor, num_nodes):
+    """Lays a table keyed by task number out by node id, inf where unknown."""
+    return np.array(
+        [times.get(node + anchor, float("inf")) for node in range(num_nodes)],
+        dtype=np.float64,
+    )
+
+
+def _clock(hour, start_hour):
+    if hour is None or abs(hour) == float("inf"):
+        return "Unavailable"
+    return time_conversion(hour, start_hour)
+
+
+if __name__ == "__main__":
+    main()
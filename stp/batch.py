@@ -0,0 +1,250 @@
+"""
+Non-interactive front end: reads task durations from a JSON Lines or CSV
+file (or stdin) and prints the schedule without prompting.
+
+    python -m stp.batch tasks.jsonl --start "5 am" --end "10 pm"
+    python -m stp.batch --format csv --start "8 am" --end "5 pm" < tasks.csv
+
+Each JSON line is a duration ("2", "1-2" or 2) or an object with a
+"duration" field. A CSV file uses its "duration" column if it has a header
+row naming one, and its first column otherwise.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+from . import instrument
+from .cache import SolveCache, fingerprint
+from .chain import chain_bounds, solve_chain
+from .conflict import explain
+from .constraints import ConstraintSet, duration_bounds
+from .core import (
+    build_graph,
+    convert_to_24_hour_format,
+    parse_duration,
+    solve_schedule,
+    time_conversion,
+)
+from .montecarlo import simulate_makespan
+from .parallel import solve_components
+from .stnu import build_stnu, dynamic_controllability
+
+
+def _jsonl_durations(stream):
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = record["duration"]
+        except json.JSONDecodeError as error:
+            raise ValueError(f"line {line_number}: {error.msg}")
+        except KeyError:
+            raise ValueError(f'line {line_number}: no "duration" field')
+        yield line_number, str(record)
+
+
+def _csv_durations(stream):
+    rows = csv.reader(stream)
+    first = next(rows, None)
+    if first is None:
+        return
+    column = 0
+    header = [cell.strip().lower() for cell in first]
+    if "duration" in header:
+        column = header.index("duration")
+    else:
+        yield 1, first[column]
+    for line_number, row in enumerate(rows, 2):
+        if not row:
+            continue
+        if len(row) <= column:
+            raise ValueError(f"line {line_number}: no duration column")
+        yield line_number, row[column]
+
+
+@instrument.timed("input")
+def load_constraints(source="-", fmt=None):
+    """
+    Reads one duration per task from a file path, or stdin for "-", and
+    returns (constraints, num_tasks) in the shape get_user_input produces,
+    with the durations parsed straight into a ConstraintSet.
+
+    fmt is "jsonl" or "csv"; by default it is taken from the file extension.
+    Raises ValueError naming the line of the first bad duration, malformed
+    JSON line or CSV row without a duration, and OSError if the file
+    cannot be read.
+    """
+    if fmt is None:
+        fmt = "csv" if str(source).lower().endswith(".csv") else "jsonl"
+    reader = _csv_durations if fmt == "csv" else _jsonl_durations
+
+    stream = sys.stdin if source == "-" else open(source, newline="")
+    try:
+        parsed = {}
+        lower = []
+        upper = []
+        for line_number, text in reader(stream):
+            text = text.strip()
+            # Generated schedules repeat a handful of durations, so each
+            # distinct string is parsed once
+            if text not in parsed:
+                try:
+                    parsed[text] = duration_bounds(parse_duration(text))
+                except ValueError as error:
+                    raise ValueError(f"line {line_number}: {error}")
+            bounds = parsed[text]
+            lower.append(bounds[0])
+            upper.append(bounds[1])
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    num_tasks = len(lower)
+    tasks = np.arange(num_tasks)
+    return ConstraintSet.from_arrays(tasks, tasks + 1, lower, upper), num_tasks
+
+
+def with_day_bound(constraints, num_tasks, start_hour, end_hour):
+    """A copy of the constraints with the bound on the whole day appended."""
+    constraints = ConstraintSet(constraints)
+    constraints.append((0, num_tasks, range(0, end_hour - start_hour + 1)))
+    return constraints
+
+
+def solve(constraints, num_tasks, start_hour, end_hour, cache=None, workers=None):
+    """
+    Adds the day bound and solves the schedule, taking the linear-time path
+    for a plain task chain. Returns (earliest, latest) or (None, None).
+
+    With a SolveCache, a schedule whose graph was solved before is answered
+    from the cache. With workers, groups of tasks that only meet at x0 are
+    solved in that many processes.
+    """
+    constraints = with_day_bound(constraints, num_tasks, start_hour, end_hour)
+    if cache is not None:
+        return cache.solve(
+            fingerprint(constraints, num_tasks, start_hour, end_hour),
+            lambda: _solve(constraints, num_tasks, start_hour, end_hour, workers),
+        )
+    return _solve(constraints, num_tasks, start_hour, end_hour, workers)
+
+
+def _solve(constraints, num_tasks, start_hour, end_hour, workers):
+    chain = chain_bounds(constraints, num_tasks)
+    if chain is not None:
+        return solve_chain(*chain)
+    G = build_graph(constraints, num_tasks, start_hour, end_hour)
+    # SPFA stops as soon as a negative cycle forms, so infeasible schedules
+    # fail fast instead of running all |V| - 1 rounds
+    if workers is not None:
+        return solve_components(G, max_workers=workers, method="spfa")
+    return solve_schedule(G, method="spfa")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "source", nargs="?", default="-", help="input file, or - for stdin"
+    )
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--start", required=True, help="start of the day, e.g. '5 am'")
+    parser.add_argument("--end", required=True, help="end of the day, e.g. '10 pm'")
+    parser.add_argument(
+        "--cache-dir", help="directory to keep solved schedules in between runs"
+    )
+    parser.add_argument(
+        "--stats", help="write per-phase times and solver counters to this JSON file"
+    )
+    parser.add_argument(
+        "--stnu",
+        action="store_true",
+        help="treat range durations as out of our control and check the day can always be finished",
+    )
+    parser.add_argument(
+        "--simulate",
+        type=int,
+        metavar="N",
+        help="draw the range durations N times and report how long the day takes",
+    )
+    args = parser.parse_args(argv)
+
+    if args.stats is None:
+        return _run(parser, args)
+    with instrument.collect() as stats:
+        status = _run(parser, args)
+    stats.dump(args.stats)
+    return status
+
+
+def _run(parser, args):
+    start_hour = convert_to_24_hour_format(args.start)
+    end_hour = convert_to_24_hour_format(args.end)
+    if start_hour >= end_hour:
+        parser.error("the start time must be earlier than the end time")
+
+    try:
+        constraints, num_tasks = load_constraints(args.source, args.format)
+    except ValueError as error:
+        parser.error(str(error))
+    except OSError as error:
+        parser.error(f"cannot read {args.source}: {error.strerror}")
+    if num_tasks == 0:
+        parser.error("no tasks found in the input")
+
+    cache = None if args.cache_dir is None else SolveCache(directory=args.cache_dir)
+    earliest, latest = solve(constraints, num_tasks, start_hour, end_hour, cache)
+    if earliest is None:
+        print("No solution exists.")
+        constraints = with_day_bound(constraints, num_tasks, start_hour, end_hour)
+        conflict = explain(constraints, num_tasks, start_hour, end_hour)
+        if conflict is not None:
+            print("These constraints cannot all hold:")
+            for line in conflict.describe(constraints, num_tasks):
+                print(f"  {line}")
+        return 1
+
+    with instrument.phase("print"):
+        print("Earliest start times:")
+        for node, hour in enumerate(earliest.tolist()[1:], 1):
+            print(f"x{node}: {time_conversion(int(hour), start_hour)}")
+
+        print("\nLatest start times:")
+        for node, hour in enumerate(latest.tolist()[1:], 1):
+            print(f"x{node}: {time_conversion(int(hour), start_hour)}")
+
+    constraints = with_day_bound(constraints, num_tasks, start_hour, end_hour)
+    if args.simulate:
+        try:
+            report = simulate_makespan(
+                constraints, num_tasks, start_hour, end_hour, args.simulate
+            )
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"\nOver {args.simulate} simulated days:")
+        for line in report.describe():
+            print(f"  {line}")
+
+    if args.stnu:
+        stnu = build_stnu(constraints, num_tasks, start_hour, end_hour)
+        if dynamic_controllability(stnu) is None:
+            print(
+                "\nThe range durations can run long or short in ways that "
+                "leave no way to finish the day in time."
+            )
+            return 1
+        print(
+            f"\nThe day can always be finished in time, whatever the "
+            f"{len(stnu.links)} range duration(s) turn out to be."
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Memoises solved schedules by a fingerprint of their distance graph, so a
+resubmitted day plan skips the solve.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from .core import build_graph
+
+# Rough per-entry cost of the dict slot, key and tuple on top of the arrays
+_ENTRY_OVERHEAD = 200
+
+
+def fingerprint(constraints, num_tasks, start_hour, end_hour):
+    """
+    Hex blake2b digest of the graph build_graph makes from the constraints,
+    plus the start and end hours.
+
+    The graph's edges are already deduplicated (the last constraint on a
+    pair wins) and sorted by (source, target), with each bound folded into
+    an edge weight, so constraint sets that only differ in order or in
+    overridden duplicates hash the same.
+    """
+    G = build_graph(constraints, num_tasks, start_hour, end_hour)
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(np.array([G.num_nodes, start_hour, end_hour], dtype=np.int64))
+    digest.update(G.src)
+    digest.update(G.dst)
+    digest.update(G.weight)
+    return digest.hexdigest()
+
+
+class SolveCache:
+    """
+    LRU cache of (earliest, latest) results keyed by fingerprint.
+
+    Entries are evicted least recently used first once their arrays take
+    more than max_bytes. A (None, None) result, i.e. an infeasible
+    schedule, is cached like any other. With a directory, results are also
+    written there as .npz files and read back on a memory miss; that tier
+    is never evicted.
+
+    Cached arrays are read-only and shared between callers.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.size_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def miss_rate(self):
+        lookups = self.hits + self.misses
+        return self.misses / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "miss_rate": self.miss_rate,
+        }
+
+    def get(self, key):
+        """The cached (earliest, latest) for key, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.disk_hits += 1
+        self._remember(key, result)
+        return result
+
+    def put(self, key, result):
+        earliest, latest = result
+        if earliest is not None:
+            result = (_frozen(earliest), _frozen(latest))
+        self._remember(key, result)
+        self._store(key, result)
+        return result
+
+    def solve(self, key, solver):
+        """Returns the cached result for key, calling solver() on a miss."""
+        result = self.get(key)
+        if result is None:
+            result = self.put(key, solver())
+        return result
+
+    def clear(self):
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def _remember(self, key, result):
+        if key in self._entries:
+            self.size_bytes -= self._entries.pop(key)[1]
+        size = _ENTRY_OVERHEAD + sum(
+            array.nbytes for array in result if array is not None
+        )
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (result, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size_bytes -= evicted
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                if not data["feasible"]:
+                    return None, None
+                return _frozen(data["earliest"]), _frozen(data["latest"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _store(self, key, result):
+        if self.directory is None:
+            return
+        earliest, latest = result
+        # Written under a temporary name first so a reader never sees half
+        # a file
+        temporary = self._path(key) + f".{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            if earliest is None:
+                np.savez(f, feasible=False)
+            else:
+                np.savez(f, feasible=True, earliest=earliest, latest=latest)
+        os.replace(temporary, self._path(key))
+
+
+def _frozen(array):
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
@@ -0,0 +1,70 @@
+import numpy as np
+
+from . import instrument
+from .constraints import as_constraint_set
+
+
+@instrument.timed("chain_bounds")
+def chain_bounds(constraints, num_tasks):
+    """
+    Checks whether the constraints are exactly the task chain (i, i + 1) for
+    every task plus the single (0, num_tasks) bound for the whole day.
+
+    Returns (lower, upper, global_lower, global_upper), where lower[i] and
+    upper[i] bound the duration of the edge from x{i} to x{i + 1}, or None if
+    the constraints have any other shape.
+    """
+    if num_tasks < 2:
+        # With one task the chain edge and the day bound are the same edge
+        return None
+
+    constraints = as_constraint_set(constraints)
+    src, dst = constraints.src, constraints.dst
+    if ((src < 0) | (src > num_tasks) | (dst < 0) | (dst > num_tasks)).any():
+        return None
+
+    # A repeated pair overrides the earlier one, as it does in build_graph
+    keys = src * (num_tasks + 1) + dst
+    unique_keys, last = np.unique(keys[::-1], return_index=True)
+    last = len(keys) - 1 - last
+
+    chain_keys = np.arange(num_tasks) * (num_tasks + 2) + 1
+    global_key = num_tasks
+    if not np.array_equal(unique_keys, np.sort(np.append(chain_keys, global_key))):
+        return None
+
+    is_global = unique_keys == global_key
+    rows = last[~is_global]
+    global_row = last[is_global][0]
+    return (
+        constraints.lower[rows],
+        constraints.upper[rows],
+        int(constraints.lower[global_row]),
+        int(constraints.upper[global_row]),
+    )
+
+
+@instrument.timed("solve_chain")
+def solve_chain(lower, upper, global_lower, global_upper):
+    """
+    Earliest and latest times of x0..xn for a chain, in O(n) with prefix sums.
+
+    The only simple cycles in a chain closed by the day bound are the
+    two-edge cycle on each constraint and the ring in either direction, so
+    the schedule is feasible exactly when none of those is negative.
+    Returns (earliest, latest) arrays, or (None, None) if it is infeasible.
+    """
+    lower_sum = np.concatenate(([0], np.cumsum(lower)))
+    upper_sum = np.concatenate(([0], np.cumsum(upper)))
+
+    if (
+        (upper < lower).any()
+        or global_upper < global_lower
+        or global_upper < lower_sum[-1]
+        or upper_sum[-1] < global_lower
+    ):
+        return None, None
+
+    earliest = np.maximum(lower_sum, global_lower - (upper_sum[-1] - upper_sum))
+    latest = np.minimum(upper_sum, global_upper - (lower_sum[-1] - lower_sum))
+    return earliest, latest
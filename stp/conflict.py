@@ -0,0 +1,110 @@
+"""
+Explains an infeasible schedule by the constraints on one negative cycle of
+its distance graph.
+"""
+
+from . import instrument
+from .constraints import as_constraint_set
+from .core import DAY_EDGE, START_EDGE, build_graph
+from .engine import spfa, trace_cycle
+
+
+class Conflict:
+    """
+    A negative cycle in the graph build_graph made, traced back to the
+    bounds that form it. No solution can satisfy all of them at once.
+
+    nodes lists the node ids around the cycle, starting and ending at the
+    same node, and weight is its (negative) length. bounds has one
+    (index, side, value) entry per cycle edge: the position of the
+    constraint in the list given to build_graph, whether the edge is its
+    "upper" or "lower" bound, and the bound itself. The two edges
+    build_graph adds on its own have index START_EDGE or DAY_EDGE and side
+    "start" or "day".
+    """
+
+    __slots__ = ("nodes", "weight", "bounds")
+
+    def __init__(self, nodes, weight, bounds):
+        self.nodes = nodes
+        self.weight = weight
+        self.bounds = bounds
+
+    @classmethod
+    def from_cycle(cls, G, cycle):
+        bounds = []
+        weight = 0
+        for u, v in zip(cycle, cycle[1:]):
+            edge = G.find_edge(u, v)
+            origin = int(G.origin[edge])
+            if origin == START_EDGE:
+                bounds.append((START_EDGE, "start", int(G.weight[edge])))
+            elif origin == DAY_EDGE:
+                bounds.append((DAY_EDGE, "day", int(G.weight[edge])))
+            elif origin % 2 == 0:
+                bounds.append((origin // 2, "upper", int(G.weight[edge])))
+            else:
+                bounds.append((origin // 2, "lower", -int(G.weight[edge])))
+            weight += int(G.weight[edge])
+        return cls(cycle, weight, bounds)
+
+    def constraint_indices(self):
+        """Sorted positions of the user constraints taking part."""
+        return sorted({index for index, _, _ in self.bounds if index >= 0})
+
+    def describe(self, constraints, num_tasks):
+        """One line per bound on the cycle, saying what it is."""
+        constraints = as_constraint_set(constraints)
+        lines = []
+        for index, side, value in self.bounds:
+            if index == START_EDGE:
+                lines.append(f"t(x1) - t(x0) <= {value} (start of the day)")
+                continue
+            if index == DAY_EDGE:
+                lines.append(f"t(x{num_tasks}) - t(x0) <= {value} (length of the day)")
+                continue
+            i = int(constraints.src[index])
+            j = int(constraints.dst[index])
+            if (i, j) == (0, num_tasks):
+                what = "length of the day"
+            elif j == i + 1:
+                what = f"duration of task {j}"
+            else:
+                what = f"constraint {index}"
+            relation = "<=" if side == "upper" else ">="
+            lines.append(f"t(x{j}) - t(x{i}) {relation} {value} ({what})")
+        return lines
+
+    def __str__(self):
+        return (
+            " -> ".join(f"x{node}" for node in self.nodes)
+            + f" has length {self.weight}"
+        )
+
+
+@instrument.timed("find_conflict")
+def find_conflict(G, source=0):
+    """
+    Looks for a negative cycle in a graph from build_graph, first among the
+    paths out of source and then among those into it. Returns a Conflict,
+    or None if the schedule is feasible.
+
+    SPFA stops as soon as the cycle closes, so a large infeasible schedule
+    fails about as fast as it takes to reach the cycle.
+    """
+    _, predecessor, witness = spfa(G.num_nodes, G.indptr, G.dst, G.weight, source)
+    if witness >= 0:
+        return Conflict.from_cycle(G, trace_cycle(predecessor, G.src, G.dst, witness))
+
+    indptr, order = G.in_csr()
+    _, predecessor, witness = spfa(G.num_nodes, indptr, G.src, G.weight, source, order)
+    if witness >= 0:
+        # Found on the reversed edges, so it runs the other way in G
+        cycle = trace_cycle(predecessor, G.dst, G.src, witness)
+        return Conflict.from_cycle(G, cycle[::-1])
+    return None
+
+
+def explain(constraints, num_tasks, start_hour, end_hour):
+    """find_conflict on the graph of the given constraints."""
+    return find_conflict(build_graph(constraints, num_tasks, start_hour, end_hour))
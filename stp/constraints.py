@@ -0,0 +1,122 @@
+import numpy as np
+
+
+def duration_bounds(duration):
+    """
+    (lower, upper) of an int duration or an inclusive range, in O(1).
+    Raises ValueError for an empty range.
+    """
+    if isinstance(duration, range):
+        if not duration:
+            raise ValueError("empty duration range")
+        return duration[0], duration[-1]
+    return duration, duration
+
+
+class ConstraintSet:
+    """
+    Constraints lower <= t(x{dst}) - t(x{src}) <= upper stored as four
+    parallel int64 arrays.
+
+    Iterating yields the (i, j, duration) tuples the rest of the code uses,
+    where duration is an int for a fixed value and a range otherwise.
+    Appending is amortised O(1) and slicing returns a new ConstraintSet.
+    append and extend raise ValueError for an empty duration range.
+    """
+
+    __slots__ = ("_columns", "_size")
+
+    def __init__(self, constraints=()):
+        self._columns = np.zeros((4, 16), dtype=np.int64)
+        self._size = 0
+        self.extend(constraints)
+
+    @classmethod
+    def from_arrays(cls, src, dst, lower, upper):
+        constraint_set = cls()
+        constraint_set.extend_arrays(src, dst, lower, upper)
+        return constraint_set
+
+    @property
+    def src(self):
+        return self._columns[0, : self._size]
+
+    @property
+    def dst(self):
+        return self._columns[1, : self._size]
+
+    @property
+    def lower(self):
+        return self._columns[2, : self._size]
+
+    @property
+    def upper(self):
+        return self._columns[3, : self._size]
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        columns = self._columns[:, : self._size].tolist()
+        for i, j, lower, upper in zip(*columns):
+            yield i, j, _duration(lower, upper)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ConstraintSet.from_arrays(
+                self.src[index], self.dst[index], self.lower[index], self.upper[index]
+            )
+        i, j, lower, upper = self._columns[:, : self._size][:, index].tolist()
+        return i, j, _duration(lower, upper)
+
+    def bounds(self, index):
+        """(lower, upper) of one constraint."""
+        return int(self.lower[index]), int(self.upper[index])
+
+    def copy(self):
+        return self[:]
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > self._columns.shape[1]:
+            grown = np.zeros((4, max(needed, 2 * self._columns.shape[1])), np.int64)
+            grown[:, : self._size] = self._columns[:, : self._size]
+            self._columns = grown
+
+    def append(self, constraint):
+        i, j, duration = constraint
+        self._reserve(1)
+        self._columns[:, self._size] = (i, j, *duration_bounds(duration))
+        self._size += 1
+
+    def extend(self, constraints):
+        if isinstance(constraints, ConstraintSet):
+            self.extend_arrays(
+                constraints.src, constraints.dst, constraints.lower, constraints.upper
+            )
+            return
+        rows = [(i, j, *duration_bounds(duration)) for i, j, duration in constraints]
+        if rows:
+            self.extend_arrays(*zip(*rows))
+
+    def extend_arrays(self, src, dst, lower, upper):
+        """Appends whole columns at once."""
+        count = len(src)
+        self._reserve(count)
+        end = self._size + count
+        self._columns[0, self._size : end] = src
+        self._columns[1, self._size : end] = dst
+        self._columns[2, self._size : end] = lower
+        self._columns[3, self._size : end] = upper
+        self._size = end
+
+
+def as_constraint_set(constraints):
+    """Returns constraints itself if it is a ConstraintSet, else a copy as one."""
+    if isinstance(constraints, ConstraintSet):
+        return constraints
+    return ConstraintSet(constraints)
+
+
+def _duration(lower, upper):
+    return lower if lower == upper else range(lower, upper + 1)
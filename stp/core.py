@@ -0,0 +1,248 @@
+import numpy as np
+
+from . import instrument
+from .constraints import ConstraintSet, as_constraint_set
+from .engine import relax_rounds, spfa, trace_cycle, warm_start
+from .graph import CompactGraph
+
+# Origin tags of the two edges build_graph adds on its own
+START_EDGE = -1
+DAY_EDGE = -2
+
+
+def parse_duration(duration):
+    """
+    Parses a task duration such as '2' or '1-2' into an int or an inclusive
+    range of hours. Raises ValueError with a message for the user otherwise.
+    """
+    if "-" in duration:
+        try:
+            min_duration, max_duration = map(int, duration.split("-"))
+        except ValueError:
+            raise ValueError(
+                "Invalid range. Please enter in the correct format (e.g., '1-2')."
+            )
+        if min_duration > max_duration:
+            raise ValueError(
+                "Invalid duration range. Please ensure the start of the range is less than or equal to the end."
+            )
+        return range(min_duration, max_duration + 1)
+
+    try:
+        return int(duration)
+    except ValueError:
+        raise ValueError("Invalid input. Please enter an integer.")
+
+
+@instrument.timed("input")
+def get_user_input():
+    constraints = ConstraintSet()
+
+    num_tasks = int(input("Enter the number of tasks: "))
+
+    for i in range(num_tasks):
+        while True:
+            duration = input(
+                f"Enter the duration (in hours) of task {i + 1} (e.g., '2' or '1-2' for a range): "
+            )
+            try:
+                constraints.append((i, i + 1, parse_duration(duration)))
+                break
+            except ValueError as error:
+                print(error)
+
+    return constraints, num_tasks
+
+
+def convert_to_24_hour_format(time_str):
+    """
+    Converts a time string in the format "hh am/pm" to a 24-hour format.
+    """
+    time, period = time_str.split()
+    hour = int(time)
+
+    if period.lower() == "pm" and hour != 12:
+        hour += 12
+    elif period.lower() == "am" and hour == 12:
+        hour = 0
+
+    return hour
+
+
+def format_constraints(constraints):
+    constraints = as_constraint_set(constraints)
+    return [
+        f"{l} <= t(x{task_j}) - t(x{task_i}) <= {u}"
+        for task_i, task_j, l, u in zip(
+            constraints.src.tolist(),
+            constraints.dst.tolist(),
+            constraints.lower.tolist(),
+            constraints.upper.tolist(),
+        )
+    ]
+
+
+@instrument.timed("build_graph")
+def build_graph(constraints, num_tasks, start_hour, end_hour):
+    constraints = as_constraint_set(constraints)
+    total_hours = end_hour - start_hour
+    xi, xj = constraints.src, constraints.dst
+
+    # Each constraint adds xi -> xj (upper) and then xj -> xi (-lower), in
+    # order, so a later constraint on the same pair overrides an earlier one
+    src = np.column_stack((xi, xj)).ravel()
+    dst = np.column_stack((xj, xi)).ravel()
+    weight = np.column_stack((constraints.upper, -constraints.lower)).ravel()
+    keep = np.ones(len(src), dtype=bool)
+    keep[1::2] = ~((xi == num_tasks) & (xj == 0))
+
+    # Edge 2k is the upper bound of constraint k and edge 2k + 1 its lower
+    # bound; the two edges added here are tagged START_EDGE and DAY_EDGE
+    origin = np.arange(len(src), dtype=np.int64)
+
+    return CompactGraph(
+        num_tasks + 1,
+        np.concatenate(([0, 0], src[keep])),
+        np.concatenate(([1, num_tasks], dst[keep])),
+        np.concatenate(([start_hour, total_hours], weight[keep])),
+        np.concatenate(([START_EDGE, DAY_EDGE], origin[keep])),
+    )
+
+
+@instrument.timed("bellman_ford")
+def bellman_ford(G, source, method="bellman_ford", reverse=False, potential=None):
+    """
+    Single-source shortest paths from source. A CompactGraph gives distance
+    and predecessor arrays indexed by node id; a networkx graph gives dicts
+    keyed by node name.
+
+    method is "bellman_ford" (whole rounds over the edge arrays) or "spfa"
+    (worklist of changed nodes, stopping as soon as a negative cycle forms).
+    reverse=True follows every edge backwards, as on G.reverse(), without
+    copying the graph.
+
+    potential warm-starts the solve from earlier distances in the same
+    direction (an array by node id, or a dict by node name): after repairing
+    the edges they violate it runs Dijkstra on Johnson-reweighted costs,
+    which is much faster than whole rounds when an edit only tightened a
+    few constraints. Any potential gives the same result; a negative cycle
+    falls back to method to be found and reported.
+    """
+    if isinstance(G, CompactGraph):
+        nodes = None
+    else:
+        G, nodes = CompactGraph.from_networkx(G)
+        source = nodes.index(source)
+
+    src, dst, weight = (G.dst, G.src, G.weight) if reverse else (G.src, G.dst, G.weight)
+    indptr, order = G.in_csr() if reverse else (G.indptr, None)
+    result = None
+    if potential is not None:
+        if nodes is not None:
+            potential = [potential.get(node, float("inf")) for node in nodes]
+        result = warm_start(
+            G.num_nodes, indptr, src, dst, weight, source, potential, order
+        )
+    if result is not None:
+        distances, predecessor, witness = result
+    elif method == "spfa":
+        distances, predecessor, witness = spfa(
+            G.num_nodes, indptr, dst, weight, source, order
+        )
+    else:
+        distances, predecessor, witness = relax_rounds(
+            G.num_nodes, src, dst, weight, source
+        )
+
+    if witness >= 0:
+        cycle = trace_cycle(predecessor, src, dst, witness)
+        if cycle is None:
+            # Whole rounds can leave the cycle out of the predecessor graph;
+            # the witness SPFA stops at always closes one
+            _, predecessor, witness = spfa(
+                G.num_nodes, indptr, dst, weight, source, order
+            )
+            cycle = trace_cycle(predecessor, src, dst, witness)
+        labels = [nodes[i] if nodes else CompactGraph.label(i) for i in cycle]
+        print("Negative cycle detected: ", " -> ".join(labels))
+        return (
+            None,
+            None,
+        )
+
+    if nodes is None:
+        return distances, predecessor
+
+    distances = {
+        node: int(d) if d != float("inf") else float("inf")
+        for node, d in zip(nodes, distances.tolist())
+    }
+    predecessor = {
+        node: nodes[p] if p >= 0 else None
+        for node, p in zip(nodes, predecessor.tolist())
+    }
+    return distances, predecessor
+
+
+def solve_schedule(G, source=0, method="bellman_ford", previous=None):
+    """
+    Earliest and latest times of every node relative to source, from one
+    forward and one backward pass over the same edge arrays.
+
+    previous is an optional (earliest, latest) pair from an earlier solve,
+    indexed by node id with inf where unknown, to warm-start both passes
+    from.
+
+    Returns (earliest, latest) arrays, or (None, None) if there is a
+    negative cycle.
+    """
+    to_potential = from_potential = None
+    if previous is not None:
+        to_potential = -np.asarray(previous[0], dtype=np.float64)
+        from_potential = previous[1]
+    with instrument.phase("earliest"):
+        to_source, _ = bellman_ford(G, source, method, True, to_potential)
+    if to_source is None:
+        return None, None
+    with instrument.phase("latest"):
+        from_source, _ = bellman_ford(G, source, method, potential=from_potential)
+    if from_source is None:
+        return None, None
+    return -to_source, from_source
+
+
+def distance_table(G, distances):
+    """Maps each node id of G to its distance as an int, or inf if unreachable."""
+    return {
+        node: int(distances[node]) if distances[node] != float("inf") else float("inf")
+        for node in G.nodes()
+    }
+
+
+@instrument.timed("print_graph")
+def print_graph(G):
+    print("\nGraph:")
+    if isinstance(G, CompactGraph):
+        print("Nodes:", [G.label(node) for node in G.nodes()])
+        print("Edges:")
+        for u, v, weight in G.edges():
+            print(f"{G.label(u)} -> {G.label(v)} (weight: {weight})")
+        return
+
+    print("Nodes:", G.nodes())
+    print("Edges:")
+    for edge in G.edges(data=True):
+        print(f"{edge[0]} -> {edge[1]} (weight: {edge[2]['weight']})")
+
+
+def time_conversion(hour, start_hour):
+    """Converts the hour to a 12-hour format with AM/PM."""
+    adjusted_hour = (hour + start_hour) % 24
+    if adjusted_hour == 0:
+        return "12 AM"
+    elif adjusted_hour < 12:
+        return f"{adjusted_hour} AM"
+    elif adjusted_hour == 12:
+        return "12 PM"
+    else:
+        return f"{adjusted_hour - 12} PM"
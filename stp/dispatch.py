@@ -0,0 +1,225 @@
+"""
+Compiles a schedule into a minimal dispatchable network (Muscettola, Morris
+and Tsamardinos 1998) and executes it one time point at a time.
+
+Once compiled, recording that a task started only updates the windows of
+the time points next to it in the filtered network, instead of solving the
+rest of the schedule again.
+"""
+
+import heapq
+
+import numpy as np
+
+from . import instrument
+from .minimal_network import minimal_network
+
+
+class DispatchableNetwork:
+    """
+    Minimal dispatchable network of a simple temporal network.
+
+    Time points that are rigidly bound together are collapsed onto one
+    leader, the earliest of them: t(node) = t(leader[node]) + offset[node].
+    succ[u][v] = w and pred[v][u] = w for each remaining edge
+    t(v) - t(u) <= w between leaders; every other edge of the minimal
+    network is implied by these through propagation to neighbours only.
+    """
+
+    __slots__ = ("num_nodes", "leader", "offset", "succ", "pred")
+
+    def __init__(self, num_nodes, leader, offset, succ, pred):
+        self.num_nodes = num_nodes
+        self.leader = leader
+        self.offset = offset
+        self.succ = succ
+        self.pred = pred
+
+    def number_of_edges(self):
+        return sum(len(edges) for edges in self.succ.values())
+
+    def edges(self):
+        for u, edges in self.succ.items():
+            for v, weight in edges.items():
+                yield u, v, weight
+
+    def dispatcher(self, reference=0):
+        return Dispatcher(self, reference)
+
+
+@instrument.timed("compile_dispatchable")
+def compile_dispatchable(G):
+    """
+    Builds the minimal dispatchable network of the graph returned by
+    build_graph, or returns None if it has no solution.
+
+    The all-pairs minimal network is filtered with Muscettola's triangle
+    rules after collapsing rigid components: a non-negative edge A -> C is
+    dominated by a non-negative B -> C, and a negative A -> C by a negative
+    A -> B, whenever D(A, B) + D(B, C) = D(A, C). Each intermediate node
+    B is one whole-matrix step, as in Floyd-Warshall.
+    """
+    network = minimal_network(G)
+    if network is None:
+        return None
+    D = network.matrix
+    n = len(D)
+
+    # t(j) - t(i) is fixed exactly when D(i, j) = -D(j, i); each rigid
+    # component is led by its earliest member
+    rigid = np.isfinite(D) & (D == -D.T)
+    leader = np.argmin(np.where(rigid, D, np.inf), axis=1)
+    offset = D[leader, np.arange(n)]
+
+    leaders = np.flatnonzero(leader == np.arange(n))
+    sub = D[np.ix_(leaders, leaders)]
+    finite = np.isfinite(sub)
+    np.fill_diagonal(finite, False)
+
+    dominated = np.zeros_like(finite)
+    for b in range(len(leaders)):
+        tight = finite & (sub[:, b, None] + sub[None, b, :] == sub)
+        upper = (sub >= 0) & (sub[None, b, :] >= 0)
+        lower = (sub < 0) & (sub[:, b, None] < 0)
+        mask = tight & (upper | lower)
+        mask[b, :] = False
+        mask[:, b] = False
+        dominated |= mask
+
+    names = leaders.tolist()
+    succ = {u: {} for u in names}
+    pred = {u: {} for u in names}
+    rows, cols = np.nonzero(finite & ~dominated)
+    for a, c in zip(rows.tolist(), cols.tolist()):
+        weight = int(sub[a, c])
+        succ[names[a]][names[c]] = weight
+        pred[names[c]][names[a]] = weight
+
+    return DispatchableNetwork(
+        n, leader.tolist(), [int(x) for x in offset.tolist()], succ, pred
+    )
+
+
+class Dispatcher:
+    """
+    Executes a DispatchableNetwork as time goes by.
+
+    The reference time point is executed at time 0 on creation, unless some
+    time point has to run before it; dispatching then starts with those
+    enabled and the reference runs in its turn like any other time point.
+    execute(k, t) records that x{k} happened at t and narrows the windows of
+    its neighbours only. Times must not go backwards, a time point may only
+    run once every time point it has to follow has run, and no time point
+    may be left behind past its latest time; execute raises ValueError when
+    asked to break any of these, so as long as it accepts, the rest of the
+    schedule can still be met.
+    """
+
+    __slots__ = (
+        "network",
+        "lower",
+        "upper",
+        "times",
+        "now",
+        "_waiting",
+        "_deadlines",
+    )
+
+    def __init__(self, network, reference=0):
+        self.network = network
+        self.lower = {u: -float("inf") for u in network.succ}
+        self.upper = {u: float("inf") for u in network.succ}
+        self.times = {}
+        self.now = -float("inf")
+        # A negative edge u -> v means v comes before u
+        self._waiting = {
+            u: sum(1 for w in edges.values() if w < 0)
+            for u, edges in network.succ.items()
+        }
+        self._deadlines = []
+        if not self._waiting[network.leader[reference]]:
+            self.execute(reference, 0)
+
+    def window(self, node):
+        """(earliest, latest) time x{node} can still run at, or (t, t) once
+        it ran at t."""
+        leader = self.network.leader[node]
+        offset = self.network.offset[node]
+        if leader in self.times:
+            return self.times[leader] + offset, self.times[leader] + offset
+        return self.lower[leader] + offset, self.upper[leader] + offset
+
+    def time(self, node):
+        """When x{node} ran, or None if it has not yet."""
+        leader = self.network.leader[node]
+        if leader not in self.times:
+            return None
+        return self.times[leader] + self.network.offset[node]
+
+    def enabled(self):
+        """Time points not yet run whose predecessors have all run."""
+        return [
+            node
+            for node, leader in enumerate(self.network.leader)
+            if leader not in self.times and not self._waiting[leader]
+        ]
+
+    def execute(self, node, t):
+        """
+        Records that x{node} happened at time t, along with the rest of its
+        rigid component. Returns the sorted time points whose window
+        narrowed.
+        """
+        network = self.network
+        leader = network.leader[node]
+        t -= network.offset[node]
+        if leader in self.times:
+            raise ValueError(f"x{node} has already run")
+        if self._waiting[leader]:
+            raise ValueError(f"x{node} has to wait for an earlier time point")
+        if t < self.now:
+            raise ValueError(f"x{node} cannot run before time {self.now}")
+        if not self.lower[leader] <= t <= self.upper[leader]:
+            low, high = self.window(node)
+            raise ValueError(f"x{node} has to run between {low} and {high}")
+        deadline = self._next_deadline(leader)
+        if deadline is not None and deadline[0] < t:
+            raise ValueError(f"x{deadline[1]} had to run by {deadline[0]}")
+
+        self.times[leader] = t
+        self.now = t
+        changed = []
+        for v, weight in network.succ[leader].items():
+            if v in self.times:
+                continue
+            if t + weight < self.upper[v]:
+                self.upper[v] = t + weight
+                heapq.heappush(self._deadlines, (t + weight, v))
+                changed.append(v)
+        for v, weight in network.pred[leader].items():
+            if v in self.times:
+                continue
+            if weight < 0:
+                self._waiting[v] -= 1
+            if t - weight > self.lower[v]:
+                self.lower[v] = t - weight
+                changed.append(v)
+        return sorted(set(changed))
+
+    def _next_deadline(self, running):
+        """(latest time, node) of the most urgent pending time point other
+        than running, dropping heap entries that went stale."""
+        heap = self._deadlines
+        while heap:
+            deadline, node = heap[0]
+            if node in self.times or deadline != self.upper[node]:
+                heapq.heappop(heap)
+            elif node == running:
+                # Look past it without losing it
+                entry = heapq.heappop(heap)
+                result = self._next_deadline(running)
+                heapq.heappush(heap, entry)
+                return result
+            else:
+                return deadline, node
+        return None
@@ -0,0 +1,295 @@
+import heapq
+from collections import deque
+
+import numpy as np
+
+from . import instrument
+
+
+def edge_arrays(G):
+    """
+    Flattens a weighted DiGraph into its node list and three parallel int64
+    arrays holding the source, target and weight of every edge.
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    num_edges = G.number_of_edges()
+
+    src = np.empty(num_edges, dtype=np.int64)
+    dst = np.empty(num_edges, dtype=np.int64)
+    weight = np.empty(num_edges, dtype=np.int64)
+    for k, (u, v, w) in enumerate(G.edges(data="weight")):
+        src[k] = index[u]
+        dst[k] = index[v]
+        weight[k] = w
+
+    return nodes, src, dst, weight
+
+
+def relax_round(distances, predecessor, src, dst, weight):
+    """
+    Relaxes every edge once against the distances of the previous round.
+    Returns the number of edges that improved a distance, so 0 once the
+    distances have converged.
+    """
+    candidate = distances[src] + weight
+    improved = candidate < distances[dst]
+    relaxed = int(np.count_nonzero(improved))
+    if not relaxed:
+        return 0
+
+    targets = dst[improved]
+    candidate = candidate[improved]
+    np.minimum.at(distances, targets, candidate)
+
+    # Several edges may reach the same target; keep one whose value won
+    winners = candidate == distances[targets]
+    predecessor[targets[winners]] = src[improved][winners]
+    return relaxed
+
+
+def relax_rounds(num_nodes, src, dst, weight, source):
+    """
+    Bellman-Ford over edge arrays, relaxing a whole round at a time and
+    stopping as soon as a round changes nothing.
+
+    Returns (distances, predecessor, witness). Unreachable nodes keep an
+    infinite distance and a predecessor of -1. witness is the index of an
+    edge that can still be relaxed after |V| - 1 rounds (so a negative cycle
+    is reachable from source), or -1 if there is none.
+    """
+    distances = np.full(num_nodes, np.inf)
+    predecessor = np.full(num_nodes, -1, dtype=np.int64)
+    distances[source] = 0
+    instrument.peak(nodes=num_nodes)
+
+    relaxations = 0
+    for rounds in range(1, num_nodes):
+        relaxed = relax_round(distances, predecessor, src, dst, weight)
+        relaxations += relaxed
+        if not relaxed:
+            instrument.count(
+                rounds=rounds, relaxations=relaxations, edge_scans=rounds * len(src)
+            )
+            instrument.peak(early_exit_round=rounds)
+            return distances, predecessor, -1
+
+    rounds = max(num_nodes - 1, 0)
+    instrument.count(
+        rounds=rounds, relaxations=relaxations, edge_scans=(rounds + 1) * len(src)
+    )
+    improvable = np.flatnonzero(distances[src] + weight < distances[dst])
+    witness = int(improvable[0]) if len(improvable) else -1
+    return distances, predecessor, witness
+
+
+def trace_cycle(predecessor, src, dst, witness):
+    """
+    Finds the negative cycle behind a witness edge, in time linear in the
+    number of nodes walked.
+
+    The walk starts at the head of the witness edge, steps back over it to
+    its tail and then follows predecessors, recording the step at which each
+    node was first seen; the first node seen twice closes the cycle.
+    Returns the node ids of the cycle in edge order, starting and ending at
+    the same node, or None if the walk runs out of predecessors first.
+    """
+    seen_at = {}
+    walk = []
+    u = int(dst[witness])
+    step_back = int(src[witness])
+    while u not in seen_at:
+        seen_at[u] = len(walk)
+        walk.append(u)
+        u = step_back
+        if u < 0:
+            return None
+        step_back = int(predecessor[u])
+
+    # The walk went against the edges, so the cycle reads backwards
+    cycle = walk[seen_at[u] :][::-1]
+    cycle.append(cycle[0])
+    return cycle
+
+
+def spfa(num_nodes, indptr, dst, weight, source, order=None):
+    """
+    Queue-based shortest paths (SPFA) with Tarjan's subtree disassembly.
+
+    Edges must be grouped by source node, with indptr the CSR row pointer
+    over dst and weight, or over order if given, which lists the edge
+    indices in grouped order instead. Only the out-edges of nodes whose distance changed
+    are scanned. The shortest-path tree is kept as a preorder thread; when a
+    node improves, its whole subtree is detached, since those labels are now
+    stale. If the edge being relaxed starts inside that subtree it closes a
+    negative cycle, which is reported straight away.
+
+    Returns (distances, predecessor, witness) like relax_rounds.
+    """
+    indptr = indptr.tolist()
+    order = range(len(dst)) if order is None else order.tolist()
+    targets = dst.tolist()
+    weights = weight.tolist()
+
+    distances = [float("inf")] * num_nodes
+    parent = [-1] * num_nodes
+    depth = [0] * num_nodes
+    after = list(range(num_nodes))
+    before = list(range(num_nodes))
+    in_tree = [False] * num_nodes
+    queued = [False] * num_nodes
+
+    distances[source] = 0
+    in_tree[source] = True
+    queued[source] = True
+    queue = deque([source])
+    witness = -1
+    scans = relaxations = 0
+
+    while queue and witness < 0:
+        u = queue.popleft()
+        if not queued[u]:
+            continue
+        queued[u] = False
+        scans += indptr[u + 1] - indptr[u]
+
+        for k in range(indptr[u], indptr[u + 1]):
+            edge = order[k]
+            v = targets[edge]
+            candidate = distances[u] + weights[edge]
+            if candidate >= distances[v]:
+                continue
+
+            if in_tree[v]:
+                # Detach the subtree of v, watching for u inside it
+                closes_cycle = v == u
+                x = after[v]
+                while not closes_cycle and x != v and depth[x] > depth[v]:
+                    closes_cycle = x == u
+                    in_tree[x] = False
+                    queued[x] = False
+                    x = after[x]
+                if closes_cycle:
+                    witness = edge
+                    break
+                after[before[v]] = x
+                before[x] = before[v]
+
+            relaxations += 1
+            distances[v] = candidate
+            parent[v] = u
+            depth[v] = depth[u] + 1
+            in_tree[v] = True
+            after[v] = after[u]
+            before[after[u]] = v
+            after[u] = v
+            before[v] = u
+            if not queued[v]:
+                queued[v] = True
+                queue.append(v)
+
+    instrument.count(relaxations=relaxations, edge_scans=scans)
+    instrument.peak(nodes=num_nodes)
+    return (
+        np.array(distances),
+        np.array(parent, dtype=np.int64),
+        witness,
+    )
+
+
+def warm_start(num_nodes, indptr, src, dst, weight, source, potential, order=None):
+    """
+    Shortest paths from source by Dijkstra on costs reweighted with a
+    potential, as in Johnson's algorithm.
+
+    potential is a distance vector from an earlier solve, e.g. before an
+    edit, with inf for nodes it knows nothing about. Edges it violates (the
+    ones an edit tightened or added) are repaired first by lowering the
+    potential from their heads, after which every reweighted cost
+    w(u, v) + p(u) - p(v) is non-negative and one Dijkstra pass from source
+    is exact. Edges are grouped by source like in spfa, with src giving
+    the tail of every edge.
+
+    Returns (distances, predecessor, -1) like relax_rounds, or None if the
+    repair runs past its work budget, which a negative cycle always does;
+    the caller then solves from scratch to find it.
+    """
+    indptr = indptr.tolist()
+    order = range(len(dst)) if order is None else order.tolist()
+    targets = dst.tolist()
+
+    # Nodes without a potential get one above any path length, which is
+    # the same as leaving them out of the reweighting
+    potential = np.array(potential, dtype=np.float64)
+    known = np.isfinite(potential)
+    if not known[source]:
+        potential[source] = 0.0
+        known[source] = True
+    ceiling = potential[known].max() + np.abs(weight).sum() + 1.0
+    potential[~known] = ceiling
+
+    reduced = weight + potential[src] - potential[dst]
+    violated = np.flatnonzero(reduced < 0)
+    reduced = reduced.tolist()
+
+    # Lower the potential from the heads of violated edges, nodes that drop
+    # the most first
+    drop = [0.0] * num_nodes
+    heap = []
+    for edge in violated.tolist():
+        v = targets[edge]
+        if reduced[edge] < drop[v]:
+            drop[v] = reduced[edge]
+            heap.append((drop[v], v))
+    heapq.heapify(heap)
+    budget = 2 * (num_nodes + len(targets))
+    scans = relaxations = 0
+    while heap:
+        amount, u = heapq.heappop(heap)
+        if amount > drop[u]:
+            continue
+        budget -= 1
+        if budget < 0:
+            return None
+        scans += indptr[u + 1] - indptr[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            edge = order[k]
+            v = targets[edge]
+            candidate = amount + reduced[edge]
+            if candidate < drop[v]:
+                relaxations += 1
+                drop[v] = candidate
+                heapq.heappush(heap, (candidate, v))
+
+    if any(drop):
+        potential += drop
+        reduced = (weight + potential[src] - potential[dst]).tolist()
+
+    # Dijkstra on the now non-negative reduced costs
+    distances = [float("inf")] * num_nodes
+    parent = [-1] * num_nodes
+    done = [False] * num_nodes
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        scans += indptr[u + 1] - indptr[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            edge = order[k]
+            v = targets[edge]
+            candidate = distance + reduced[edge]
+            if candidate < distances[v]:
+                relaxations += 1
+                distances[v] = candidate
+                parent[v] = u
+                heapq.heappush(heap, (candidate, v))
+
+    instrument.count(relaxations=relaxations, edge_scans=scans, warm_starts=1)
+    instrument.peak(nodes=num_nodes)
+
+    # Undo the reweighting
+    distances = np.array(distances) + potential - potential[source]
+    return distances, np.array(parent, dtype=np.int64), -1
@@ -0,0 +1,144 @@
+"""
+Answers "can task 5 start at 3 pm?" style questions without solving again.
+
+The minimal network is decomposable: any start times that respect the
+bounds between every pair of the tasks involved (and x0) extend to a full
+schedule. Each question is therefore a handful of lookups into the
+all-pairs bounds.
+"""
+
+import numpy as np
+
+from . import instrument
+from .core import solve_schedule
+from .minimal_network import _as_int, minimal_network
+
+
+class FeasibilityIndex:
+    """
+    What-if queries over the all-pairs bounds of one solved schedule.
+
+    Times are clock hours: x0 is at anchor_hour, so with the start of the
+    day as anchor_hour, can_start(5, 15) asks whether task 5 can start at
+    3 pm. Every query is O(1) per time asked about; the *_many variants
+    take arrays that broadcast against each other and answer them in one
+    vectorized call.
+    """
+
+    __slots__ = ("matrix", "earliest", "latest", "anchor_hour")
+
+    def __init__(self, matrix, anchor_hour=0):
+        self.matrix = matrix
+        self.anchor_hour = anchor_hour
+        self.earliest = anchor_hour - matrix[:, 0]
+        self.latest = anchor_hour + matrix[0, :]
+
+    @property
+    def num_nodes(self):
+        return len(self.matrix)
+
+    def window(self, task):
+        """(earliest, latest) clock hour task can start at."""
+        return _as_int(self.earliest[task]), _as_int(self.latest[task])
+
+    def can_start(self, task, hour):
+        """Whether some schedule starts task at hour."""
+        return bool(self.earliest[task] <= hour <= self.latest[task])
+
+    def can_separate(self, i, j, gap):
+        """Whether some schedule starts task j exactly gap hours after i."""
+        return bool(-self.matrix[j, i] <= gap <= self.matrix[i, j])
+
+    def can_start_both(self, i, hour_i, j, hour_j):
+        """Whether some schedule starts task i at hour_i and j at hour_j."""
+        return (
+            self.can_start(i, hour_i)
+            and self.can_start(j, hour_j)
+            and self.can_separate(i, j, hour_j - hour_i)
+        )
+
+    def can_start_many(self, tasks, hours):
+        """Boolean array answering can_start for every (task, hour) pair
+        tasks and hours broadcast to, e.g. tasks[:, None] against a row of
+        candidate hours to grey out a whole timetable."""
+        tasks = np.asarray(tasks)
+        hours = np.asarray(hours)
+        return (self.earliest[tasks] <= hours) & (hours <= self.latest[tasks])
+
+    def can_separate_many(self, i, j, gaps):
+        """Boolean array answering can_separate for broadcast i, j, gaps."""
+        i = np.asarray(i)
+        j = np.asarray(j)
+        gaps = np.asarray(gaps)
+        return (-self.matrix[j, i] <= gaps) & (gaps <= self.matrix[i, j])
+
+    def sweep(self, task, hours):
+        """sweep_start_times from the bounds already in the index."""
+        return _pinned(
+            -self.matrix[:, 0],
+            self.matrix[0, :],
+            -self.matrix[:, task],
+            self.matrix[task, :],
+            task,
+            np.asarray(hours) - self.anchor_hour,
+            self.anchor_hour,
+        )
+
+
+@instrument.timed("feasibility_index")
+def feasibility_index(G, anchor_hour=0):
+    """
+    Builds the FeasibilityIndex of the graph returned by build_graph, with
+    x0 at anchor_hour, or returns None if the network has no solution.
+    """
+    network = minimal_network(G)
+    if network is None:
+        return None
+    return FeasibilityIndex(network.matrix, anchor_hour)
+
+
+@instrument.timed("sweep")
+def sweep_start_times(G, task, hours, anchor_hour=0):
+    """
+    Earliest and latest clock hours of every node of the graph returned by
+    build_graph, for each candidate start hour of task.
+
+    Pinning task to h only adds the paths through it, so with x0 at
+    anchor_hour the new bounds of each node v are
+    max(earliest(v), h + earliest of v relative to task) and
+    min(latest(v), h + latest of v relative to task). The two solves from
+    x0 and from task give all four rows, and every candidate is then
+    one broadcast step instead of a solve of its own.
+
+    Returns (feasible, earliest, latest): feasible has one flag per
+    candidate and earliest and latest one row per candidate, NaN where the
+    candidate is infeasible.
+    """
+    earliest, latest = solve_schedule(G)
+    if earliest is not None:
+        task_earliest, task_latest = solve_schedule(G, task)
+    if earliest is None or task_earliest is None:
+        hours = np.asarray(hours)
+        nan = np.full(hours.shape + (G.num_nodes,), np.nan)
+        return np.zeros(hours.shape, dtype=bool), nan, nan.copy()
+    return _pinned(
+        earliest,
+        latest,
+        task_earliest,
+        task_latest,
+        task,
+        np.asarray(hours) - anchor_hour,
+        anchor_hour,
+    )
+
+
+def _pinned(earliest, latest, task_earliest, task_latest, task, hours, anchor_hour):
+    """Bounds of every node with task pinned to each of hours, all relative
+    to x0, shifted to clock hours."""
+    feasible = (earliest[task] <= hours) & (hours <= latest[task])
+    column = hours[..., None]
+    new_earliest = np.maximum(earliest, column + task_earliest) + anchor_hour
+    new_latest = np.minimum(latest, column + task_latest) + anchor_hour
+    new_earliest[~feasible] = np.nan
+    new_latest[~feasible] = np.nan
+    return feasible, new_earliest, new_latest
@@ -0,0 +1,106 @@
+import numpy as np
+
+
+class _Domains:
+    """
+    Every node's allowed values, sorted, in one flat array. Node v owns
+    values[offsets[v]:offsets[v + 1]]. keys encodes (node, value) so that a
+    single searchsorted finds the next allowed value of every node at once.
+    """
+
+    __slots__ = ("values", "offsets", "keys", "base", "top", "span")
+
+    def __init__(self, domains):
+        domains = [np.unique(np.asarray(list(d), dtype=np.int64)) for d in domains]
+        self.offsets = np.zeros(len(domains) + 1, dtype=np.int64)
+        np.cumsum([len(d) for d in domains], out=self.offsets[1:])
+        self.values = np.concatenate(domains) if domains else np.zeros(0, np.int64)
+
+        self.base = int(self.values.min()) if len(self.values) else 0
+        self.top = int(self.values.max()) if len(self.values) else 0
+        # One spare slot above and below each node's values keeps a clipped
+        # query from spilling into the next node's block
+        self.span = self.top - self.base + 2
+        nodes = np.repeat(np.arange(len(domains)), np.diff(self.offsets))
+        self.keys = self._key(nodes, self.values)
+
+    def _key(self, nodes, values):
+        return nodes * self.span + (values - self.base)
+
+    def at_least(self, bound):
+        """Smallest allowed value >= bound per node, or None if one has none."""
+        nodes = np.arange(len(bound))
+        bound = np.clip(bound, self.base, self.top + 1)
+        index = np.searchsorted(self.keys, self._key(nodes, bound), side="left")
+        if (index >= self.offsets[1:]).any():
+            return None
+        return self.values[index]
+
+    def at_most(self, bound):
+        """Largest allowed value <= bound per node, or None if one has none."""
+        nodes = np.arange(len(bound))
+        bound = np.clip(bound, self.base - 1, self.top)
+        index = np.searchsorted(self.keys, self._key(nodes, bound), side="right") - 1
+        if (index < self.offsets[:-1]).any():
+            return None
+        return self.values[index]
+
+
+def hour_domains(num_nodes, start_hour, end_hour, blocked_hours=()):
+    """
+    Allowed times for x0..x{num_nodes - 1} when tasks start on whole hours.
+
+    Times are hours after start_hour, as in the schedule graph. blocked_hours
+    are 24-hour clock hours nothing may be scheduled at. x0 is the start of
+    the day and is always 0.
+    """
+    hours = np.arange(end_hour - start_hour + 1)
+    open_hours = hours[~np.isin(hours + start_hour, list(blocked_hours))]
+    return [np.array([0])] + [open_hours] * (num_nodes - 1)
+
+
+def solve_finite_domain(G, domains):
+    """
+    Difference constraints t(v) - t(u) <= w for every edge u -> v of G, with
+    t(v) restricted to the values in domains[v] (Fishburn 2002).
+
+    The least solution starts every node at its smallest value and raises
+    each one to the next allowed value that satisfies its outgoing edges,
+    one vectorized round at a time, until nothing moves. The greatest
+    solution lowers from the largest values the same way. Every round moves
+    some node to another value of its domain, so this takes at most the
+    total domain size in rounds.
+
+    Returns (least, greatest) arrays, or (None, None) if no assignment
+    satisfies all the constraints.
+    """
+    domains = _Domains(domains)
+    if (np.diff(domains.offsets) == 0).any():
+        return None, None
+    src, dst, weight = G.src, G.dst, G.weight
+
+    least = domains.values[domains.offsets[:-1]]
+    while True:
+        # t(u) >= t(v) - w
+        bound = least.copy()
+        np.maximum.at(bound, src, least[dst] - weight)
+        raised = domains.at_least(bound)
+        if raised is None:
+            return None, None
+        if np.array_equal(raised, least):
+            break
+        least = raised
+
+    greatest = domains.values[domains.offsets[1:] - 1]
+    while True:
+        # t(v) <= t(u) + w
+        bound = greatest.copy()
+        np.minimum.at(bound, dst, greatest[src] + weight)
+        lowered = domains.at_most(bound)
+        if lowered is None:
+            return None, None
+        if np.array_equal(lowered, greatest):
+            break
+        greatest = lowered
+
+    return least, greatest
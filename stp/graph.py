@@ -0,0 +1,124 @@
+import numpy as np
+
+from . import instrument
+from .engine import edge_arrays
+
+
+class CompactGraph:
+    """
+    Directed weighted graph over integer node ids 0..num_nodes-1.
+
+    Edges are kept as parallel int64 arrays sorted by (source, target), with
+    a CSR row pointer so the out-edges of node u are the slice
+    indptr[u]:indptr[u + 1]. Node u is labelled "x{u}" only when printed.
+
+    origin optionally tags every edge with where it came from (build_graph
+    uses constraint positions); it is kept in step with the edges, so it
+    survives deduplication and sorting.
+    """
+
+    __slots__ = (
+        "num_nodes",
+        "src",
+        "dst",
+        "weight",
+        "origin",
+        "indptr",
+        "present",
+        "_in_csr",
+    )
+
+    def __init__(self, num_nodes, src, dst, weight, origin=None):
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight, dtype=np.int64)
+        if len(src):
+            num_nodes = max(num_nodes, int(src.max()) + 1, int(dst.max()) + 1)
+
+        # A repeated (u, v) pair overwrites the earlier weight, like
+        # nx.DiGraph.add_edge does, so keep the last occurrence of each key
+        keys = src * num_nodes + dst
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = len(keys) - 1 - last
+
+        self.num_nodes = num_nodes
+        self.src = src[keep]
+        self.dst = dst[keep]
+        self.weight = weight[keep]
+        self.origin = None if origin is None else np.asarray(origin)[keep]
+        self.indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=num_nodes), out=self.indptr[1:])
+
+        self.present = np.zeros(num_nodes, dtype=bool)
+        self.present[self.src] = True
+        self.present[self.dst] = True
+        self._in_csr = None
+
+    @classmethod
+    def from_networkx(cls, G):
+        """
+        Converts a weighted DiGraph. Returns the CompactGraph and the list of
+        node names, whose positions are the new node ids.
+        """
+        nodes, src, dst, weight = edge_arrays(G)
+        return cls(len(nodes), src, dst, weight), nodes
+
+    def to_networkx(self):
+        """
+        A networkx DiGraph with nodes named "x{id}" and the weights as the
+        "weight" edge attribute. networkx is only imported here, so the
+        solvers never need it.
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(self.label(node) for node in self.nodes())
+        G.add_weighted_edges_from(
+            (self.label(u), self.label(v), w) for u, v, w in self.edges()
+        )
+        return G
+
+    @staticmethod
+    def label(node):
+        return f"x{node}"
+
+    def nodes(self):
+        """Ids of the nodes that take part in at least one edge."""
+        return np.flatnonzero(self.present).tolist()
+
+    def number_of_edges(self):
+        return len(self.src)
+
+    def edges(self):
+        return zip(self.src.tolist(), self.dst.tolist(), self.weight.tolist())
+
+    def out_edges(self, node):
+        """Slice of the edge arrays holding the out-edges of node."""
+        return slice(self.indptr[node], self.indptr[node + 1])
+
+    def in_csr(self):
+        """
+        (indptr, order) grouping the edges by target: the in-edges of node v
+        are order[indptr[v]:indptr[v + 1]]. Lets a solver walk the graph
+        backwards without building a reversed copy.
+        """
+        if self._in_csr is None:
+            with instrument.phase("in_csr"):
+                order = np.argsort(self.dst, kind="stable")
+                indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+                np.cumsum(
+                    np.bincount(self.dst, minlength=self.num_nodes), out=indptr[1:]
+                )
+            self._in_csr = (indptr, order)
+        return self._in_csr
+
+    def reverse(self):
+        return CompactGraph(
+            self.num_nodes, self.dst, self.src, self.weight, self.origin
+        )
+
+    def find_edge(self, u, v):
+        """Index of the edge u -> v in the edge arrays, or -1 if there is none."""
+        start, stop = self.indptr[u], self.indptr[u + 1]
+        k = start + int(np.searchsorted(self.dst[start:stop], v))
+        return k if k < stop and self.dst[k] == v else -1
@@ -0,0 +1,147 @@
+import heapq
+
+from .engine import relax_rounds
+
+
+def _hours(value):
+    return int(value) if value != float("inf") else value
+
+
+class IncrementalSTN:
+    """
+    Simple temporal network that stays solved while its constraints are
+    tightened one at a time.
+
+    from_origin[v] is the shortest distance x0 -> v (the latest time of v)
+    and to_origin[v] the shortest distance v -> x0 (minus the earliest time
+    of v). Both serve as potentials: after a tightening only the nodes whose
+    distance actually drops are visited, in Dijkstra order of how far they
+    drop, so an edit costs time proportional to the part of the schedule it
+    affects.
+    """
+
+    __slots__ = ("num_nodes", "succ", "pred", "from_origin", "to_origin")
+
+    def __init__(self, num_nodes, succ, pred, from_origin, to_origin):
+        self.num_nodes = num_nodes
+        self.succ = succ
+        self.pred = pred
+        self.from_origin = from_origin
+        self.to_origin = to_origin
+
+    def earliest(self, node):
+        return -_hours(self.to_origin[node])
+
+    def latest(self, node):
+        return _hours(self.from_origin[node])
+
+    def bounds(self, node):
+        return self.earliest(node), self.latest(node)
+
+    def tighten(self, i, j, lower, upper):
+        """
+        Adds lower <= t(xj) - t(xi) <= upper on top of the current
+        constraints.
+
+        Returns the sorted ids of the nodes whose earliest or latest time
+        changed, or None if the new bounds conflict with the schedule, in
+        which case the network is left as it was.
+        """
+        undo = []
+        for u, v, weight in ((i, j, upper), (j, i, -lower)):
+            if not self._add_edge(u, v, weight, undo):
+                self._rollback(undo)
+                return None
+        return sorted({node for table, node, _ in undo if table != "edge"})
+
+    def _add_edge(self, u, v, weight, undo):
+        old = self.succ[u].get(v, float("inf"))
+        if weight >= old:
+            return True
+        undo.append(("edge", (u, v), old))
+        self.succ[u][v] = weight
+        self.pred[v][u] = weight
+
+        # x0 -> u -> v may shorten the path to v and everything after it,
+        # v -> u -> x0 may shorten the path back from u and everything before
+        return _propagate(
+            self.from_origin,
+            self.succ,
+            v,
+            self.from_origin[u] + weight,
+            u,
+            "from_origin",
+            undo,
+        ) and _propagate(
+            self.to_origin,
+            self.pred,
+            u,
+            self.to_origin[v] + weight,
+            v,
+            "to_origin",
+            undo,
+        )
+
+    def _rollback(self, undo):
+        for table, key, old in reversed(undo):
+            if table == "edge":
+                u, v = key
+                if old == float("inf"):
+                    del self.succ[u][v]
+                    del self.pred[v][u]
+                else:
+                    self.succ[u][v] = old
+                    self.pred[v][u] = old
+            else:
+                getattr(self, table)[key] = old
+
+
+def _propagate(distances, adjacency, start, value, stop, table, undo):
+    """
+    Lowers distances[start] to value and pushes the decrease along adjacency.
+    Nodes are settled in order of how much they drop, which is Dijkstra on
+    the reduced costs of the old distances. Returns False if stop is reached,
+    i.e. the new edge closes a negative cycle.
+    """
+    if value >= distances[start]:
+        return True
+
+    heap = [(value - distances[start], start)]
+    undo.append((table, start, distances[start]))
+    distances[start] = value
+
+    while heap:
+        _, node = heapq.heappop(heap)
+        for neighbour, weight in adjacency[node].items():
+            candidate = distances[node] + weight
+            if candidate < distances[neighbour]:
+                if neighbour == stop:
+                    return False
+                heapq.heappush(heap, (candidate - distances[neighbour], neighbour))
+                undo.append((table, neighbour, distances[neighbour]))
+                distances[neighbour] = candidate
+
+    return True
+
+
+def incremental_stn(G, source=0):
+    """
+    Solves the graph returned by build_graph once in both directions and
+    wraps it in an IncrementalSTN. Returns None if it has a negative cycle.
+    """
+    from_origin, _, witness = relax_rounds(G.num_nodes, G.src, G.dst, G.weight, source)
+    if witness >= 0:
+        return None
+    to_origin, _, witness = relax_rounds(G.num_nodes, G.dst, G.src, G.weight, source)
+    if witness >= 0:
+        return None
+
+    succ = [{} for _ in range(G.num_nodes)]
+    pred = [{} for _ in range(G.num_nodes)]
+    for u, v, weight in G.edges():
+        succ[u][v] = weight
+        pred[v][u] = weight
+
+    return IncrementalSTN(
+        G.num_nodes, succ, pred, from_origin.tolist(), to_origin.tolist()
+    )
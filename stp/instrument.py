@@ -0,0 +1,107 @@
+"""
+Opt-in instrumentation: wall time per phase and counters from the solvers.
+
+    with collect() as stats:
+        solve(constraints, num_tasks, start_hour, end_hour)
+    stats.dump("stats.json")
+
+Nothing is recorded outside collect(); each hook then costs one global
+lookup. Work done in other processes (solve_components) is not counted.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_stats = None
+
+
+class Stats:
+    """
+    What one collect() block recorded.
+
+    phases maps a phase name to its number of calls and total seconds;
+    phases may nest, so their times overlap. counters holds summed counts
+    (rounds, relaxations, edge_scans, ...) and peaks (nodes,
+    early_exit_round, ...). callback, if given, is called as
+    callback(name, seconds) whenever a phase ends.
+    """
+
+    def __init__(self, callback=None):
+        self.phases = {}
+        self.counters = {}
+        self.callback = callback
+
+    def add_phase(self, name, seconds):
+        entry = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if self.callback is not None:
+            self.callback(name, seconds)
+
+    def count(self, **amounts):
+        for name, amount in amounts.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def peak(self, **values):
+        for name, value in values.items():
+            self.counters[name] = max(self.counters.get(name, value), value)
+
+    def as_dict(self):
+        return {"phases": self.phases, "counters": self.counters}
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+
+@contextmanager
+def collect(callback=None):
+    """Records phases and counters into a new Stats until the block ends."""
+    global _stats
+    outer = _stats
+    _stats = Stats(callback)
+    try:
+        yield _stats
+    finally:
+        _stats = outer
+
+
+@contextmanager
+def phase(name):
+    stats = _stats
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_phase(name, time.perf_counter() - start)
+
+
+def timed(name):
+    """Decorator that records every call of the function as phase name."""
+
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if _stats is None:
+                return function(*args, **kwargs)
+            with phase(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def count(**amounts):
+    if _stats is not None:
+        _stats.count(**amounts)
+
+
+def peak(**values):
+    if _stats is not None:
+        _stats.peak(**values)
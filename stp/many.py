@@ -0,0 +1,146 @@
+"""
+Solves many independent schedules in one call, e.g. one day plan per user.
+
+All the graphs are laid side by side as one block-diagonal graph and
+relaxed together in whole-array rounds, so a small plan costs a share of a
+few numpy calls instead of a solve of its own.
+"""
+
+import numpy as np
+
+from . import instrument
+from .constraints import as_constraint_set
+from .graph import CompactGraph
+
+
+@instrument.timed("solve_many")
+def solve_many(schedules):
+    """
+    Solves each (constraints, num_tasks, start_hour, end_hour) schedule
+    like solve_schedule(build_graph(...)) would, all at once.
+
+    Returns (results, feasible): results holds one (earliest, latest) pair
+    of arrays per schedule, or (None, None) for an infeasible one, and
+    feasible is a bool array flagging which schedules have a solution.
+    """
+    constraint_sets = []
+    tasks = []
+    sizes = []
+    starts = []
+    totals = []
+    for constraints, num_tasks, start_hour, end_hour in schedules:
+        constraints = as_constraint_set(constraints)
+        # build_graph always adds the edge x0 -> x1
+        num_nodes = max(num_tasks + 1, 2)
+        if len(constraints):
+            num_nodes = max(
+                num_nodes,
+                int(constraints.src.max()) + 1,
+                int(constraints.dst.max()) + 1,
+            )
+        constraint_sets.append(constraints)
+        tasks.append(num_tasks)
+        sizes.append(num_nodes)
+        starts.append(start_hour)
+        totals.append(end_hour - start_hour)
+
+    count = len(sizes)
+    if count == 0:
+        return [], np.zeros(0, dtype=bool)
+
+    sizes = np.array(sizes, dtype=np.int64)
+    offset = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    G, block = _block_graph(
+        constraint_sets, np.array(tasks), sizes, offset, starts, totals
+    )
+
+    to_origin, backward_ok = _relax_blocks(G.dst, G.src, G.weight, block, offset, sizes)
+    from_origin, forward_ok = _relax_blocks(
+        G.src, G.dst, G.weight, block, offset, sizes
+    )
+    feasible = backward_ok & forward_ok
+
+    results = []
+    bounds = np.concatenate((offset, [G.num_nodes])).tolist()
+    for s in range(count):
+        if not feasible[s]:
+            results.append((None, None))
+            continue
+        start, stop = bounds[s], bounds[s + 1]
+        results.append((-to_origin[start:stop], from_origin[start:stop]))
+    return results, feasible
+
+
+def _block_graph(constraint_sets, tasks, sizes, offset, starts, totals):
+    """
+    The graphs build_graph would make, one per schedule, renumbered into
+    consecutive blocks of node ids. Returns the CompactGraph and the
+    schedule each of its edges belongs to.
+    """
+    counts = np.array([len(c) for c in constraint_sets], dtype=np.int64)
+    owner = np.repeat(np.arange(len(sizes)), counts)
+    shift = offset[owner]
+    num_tasks = tasks[owner]
+
+    def column(name):
+        if not len(owner):
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([getattr(c, name) for c in constraint_sets])
+
+    xi, xj = column("src"), column("dst")
+    lower, upper = column("lower"), column("upper")
+
+    # Same edges and override order as build_graph, per block: the two
+    # edges it adds come first, then each constraint's upper and lower
+    # bound in turn
+    src = np.column_stack((xi, xj)).ravel()
+    dst = np.column_stack((xj, xi)).ravel()
+    weight = np.column_stack((upper, -lower)).ravel()
+    edge_shift = np.repeat(shift, 2)
+    keep = np.ones(len(src), dtype=bool)
+    keep[1::2] = ~((xi == num_tasks) & (xj == 0))
+
+    G = CompactGraph(
+        int(sizes.sum()),
+        np.concatenate((offset, offset, (src + edge_shift)[keep])),
+        np.concatenate((offset + 1, offset + tasks, (dst + edge_shift)[keep])),
+        np.concatenate((starts, totals, weight[keep])),
+    )
+
+    # Blocks are contiguous, so an edge's schedule follows from its source
+    block = np.searchsorted(offset, G.src, side="right") - 1
+    return G, block
+
+
+def _relax_blocks(src, dst, weight, block, offset, sizes):
+    """
+    Jacobi Bellman-Ford from node 0 of every block at once.
+
+    A block whose round changes nothing has converged and its edges are
+    dropped from later rounds; one that still improves in round |V| of its
+    own has a negative cycle and is dropped as infeasible. Returns the
+    distances and a per-block feasibility flag.
+    """
+    distances = np.full(int(sizes.sum()), np.inf)
+    distances[offset] = 0
+    feasible = np.ones(len(sizes), dtype=bool)
+
+    rounds = 0
+    while len(src):
+        rounds += 1
+        candidate = distances[src] + weight
+        improved = candidate < distances[dst]
+        if not improved.any():
+            break
+        np.minimum.at(distances, dst[improved], candidate[improved])
+
+        active = np.zeros(len(sizes), dtype=bool)
+        active[block[improved]] = True
+        cyclic = active & (sizes <= rounds)
+        feasible[cyclic] = False
+        active &= ~cyclic
+
+        keep = active[block]
+        src, dst, weight, block = src[keep], dst[keep], weight[keep], block[keep]
+
+    return distances, feasible
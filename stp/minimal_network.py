@@ -0,0 +1,247 @@
+import heapq
+from itertools import combinations, permutations
+
+import numpy as np
+
+from .engine import spfa, warm_start
+from .graph import CompactGraph
+
+
+def _as_int(value):
+    return int(value) if np.isfinite(value) else float(value)
+
+
+class MinimalNetwork:
+    """
+    All-pairs minimal network of a simple temporal network.
+
+    matrix[i, j] is the largest value t(xj) - t(xi) can take in any solution
+    (inf if it is unbounded), so every pair of time points can be queried
+    without solving the network again.
+    """
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    @property
+    def num_nodes(self):
+        return len(self.matrix)
+
+    def distance(self, i, j):
+        """Upper bound on t(xj) - t(xi)."""
+        return _as_int(self.matrix[i, j])
+
+    def interval(self, i, j):
+        """(lowest, highest) possible value of t(xj) - t(xi)."""
+        return -self.distance(j, i), self.distance(i, j)
+
+    def earliest(self, node):
+        return -self.distance(node, 0)
+
+    def latest(self, node):
+        return self.distance(0, node)
+
+
+def distance_matrix(G):
+    """Dense matrix of the edge weights of G, with 0 on the diagonal."""
+    matrix = np.full((G.num_nodes, G.num_nodes), np.inf)
+    matrix[G.src, G.dst] = G.weight
+    np.fill_diagonal(matrix, np.minimum(np.diag(matrix), 0))
+    return matrix
+
+
+def minimal_network(G):
+    """
+    Runs Floyd-Warshall on the graph returned by build_graph, one vectorized
+    row/column update per intermediate node.
+
+    Returns a MinimalNetwork, or None if the network contains a negative
+    cycle (some node ends up with a negative distance to itself).
+    """
+    matrix = distance_matrix(G)
+
+    for k in range(G.num_nodes):
+        np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+        if matrix[k, k] < 0:
+            return None
+
+    if (np.diag(matrix) < 0).any():
+        return None
+    return MinimalNetwork(matrix)
+
+
+class SparseMinimalNetwork:
+    """
+    Minimal network restricted to the edges of a chordal triangulation of the
+    constraint graph, as left by partial path consistency (P3C).
+
+    Answers the same queries as MinimalNetwork. Pairs joined by a chordal
+    edge are a dictionary lookup, and the distances from and to x0 are
+    worked out once on creation, so earliest and latest are lookups too.
+    Any other pair is resolved with one Dijkstra pass over the chordal edges
+    reweighted by a shared potential, cached per source node.
+    """
+
+    __slots__ = ("num_nodes", "weights", "_graph", "_potential", "_rows", "_to_x0")
+
+    def __init__(self, num_nodes, weights):
+        self.num_nodes = num_nodes
+        self.weights = weights
+        finite = [(u, v, w) for (u, v), w in weights.items() if w != np.inf]
+
+        # A virtual node num_nodes with a 0 edge to every node gives a
+        # potential for all of them from one SPFA pass, as in Johnson's
+        # algorithm; it has no in-edges, so no real source ever reaches it
+        nodes = np.arange(num_nodes, dtype=np.int64)
+        self._graph = CompactGraph(
+            num_nodes + 1,
+            np.concatenate(([u for u, _, _ in finite], np.full(num_nodes, num_nodes))),
+            np.concatenate(([v for _, v, _ in finite], nodes)),
+            np.concatenate(([w for _, _, w in finite], np.zeros(num_nodes))),
+        )
+        G = self._graph
+        self._potential = spfa(G.num_nodes, G.indptr, G.dst, G.weight, num_nodes)[0]
+
+        self._rows = {}
+        self._to_x0 = None
+        if num_nodes:
+            self._rows[0] = self._row(0)
+            self._to_x0 = self._row(0, reverse=True)
+
+    def _row(self, source, reverse=False):
+        """Distances from source, or to it with reverse=True, by Dijkstra on
+        the reweighted chordal edges."""
+        G = self._graph
+        if reverse:
+            indptr, order = G.in_csr()
+            distances = warm_start(
+                G.num_nodes,
+                indptr,
+                G.dst,
+                G.src,
+                G.weight,
+                source,
+                -self._potential,
+                order,
+            )[0]
+        else:
+            distances = warm_start(
+                G.num_nodes, G.indptr, G.src, G.dst, G.weight, source, self._potential
+            )[0]
+        return distances[: self.num_nodes]
+
+    def distance(self, i, j):
+        """Upper bound on t(xj) - t(xi)."""
+        if i == j:
+            return 0
+        if (i, j) in self.weights:
+            return _as_int(self.weights[(i, j)])
+        if j == 0:
+            return _as_int(self._to_x0[i])
+        if i not in self._rows:
+            self._rows[i] = self._row(i)
+        return _as_int(self._rows[i][j])
+
+    def interval(self, i, j):
+        """(lowest, highest) possible value of t(xj) - t(xi)."""
+        return -self.distance(j, i), self.distance(i, j)
+
+    def earliest(self, node):
+        return -self.distance(node, 0)
+
+    def latest(self, node):
+        return self.distance(0, node)
+
+
+def elimination_order(G):
+    """
+    Min-degree vertex elimination ordering of the undirected constraint graph.
+
+    Returns (order, higher), where higher[v] lists the neighbours v still had
+    when it was eliminated. Connecting those neighbours pairwise (fill edges)
+    makes the graph chordal.
+    """
+    neighbours = [set() for _ in range(G.num_nodes)]
+    for u, v, _ in G.edges():
+        if u != v:
+            neighbours[u].add(v)
+            neighbours[v].add(u)
+
+    heap = [(len(adjacent), v) for v, adjacent in enumerate(neighbours)]
+    heapq.heapify(heap)
+    eliminated = [False] * G.num_nodes
+    order = []
+    higher = [None] * G.num_nodes
+
+    while heap:
+        degree, v = heapq.heappop(heap)
+        if eliminated[v] or degree != len(neighbours[v]):
+            continue
+        eliminated[v] = True
+        order.append(v)
+        higher[v] = list(neighbours[v])
+
+        for u in higher[v]:
+            neighbours[u].discard(v)
+        for a, b in combinations(higher[v], 2):
+            if b not in neighbours[a]:
+                neighbours[a].add(b)
+                neighbours[b].add(a)
+        for u in higher[v]:
+            heapq.heappush(heap, (len(neighbours[u]), u))
+
+    return order, higher
+
+
+def sparse_minimal_network(G):
+    """
+    Triangulates the graph returned by build_graph with a min-degree
+    ordering and runs P3C on the chordal graph: a forward sweep along the
+    ordering (directional path consistency) followed by a backward sweep.
+
+    Returns a SparseMinimalNetwork, or None if the network contains a
+    negative cycle.
+    """
+    order, higher = elimination_order(G)
+
+    weights = {}
+    for u, v, w in G.edges():
+        if u == v:
+            if w < 0:
+                return None
+            continue
+        weights[(u, v)] = w
+        weights.setdefault((v, u), np.inf)
+    for v in order:
+        for a, b in combinations(higher[v], 2):
+            weights.setdefault((a, b), np.inf)
+            weights.setdefault((b, a), np.inf)
+
+    for k in order:
+        for i, j in combinations(higher[k], 2):
+            weights[(i, j)] = min(weights[(i, j)], weights[(i, k)] + weights[(k, j)])
+            weights[(j, i)] = min(weights[(j, i)], weights[(j, k)] + weights[(k, i)])
+            if weights[(i, j)] + weights[(j, i)] < 0:
+                return None
+        for i in higher[k]:
+            if weights[(i, k)] + weights[(k, i)] < 0:
+                return None
+
+    for k in reversed(order):
+        for i, j in permutations(higher[k], 2):
+            weights[(i, k)] = min(weights[(i, k)], weights[(i, j)] + weights[(j, k)])
+            weights[(k, i)] = min(weights[(k, i)], weights[(k, j)] + weights[(j, i)])
+
+    return SparseMinimalNetwork(G.num_nodes, weights)
+
+
+def solve_minimal_network(G, dense_limit=2000):
+    """
+    Minimal network of G: dense Floyd-Warshall for up to dense_limit nodes,
+    sparse P3C for anything larger.
+    """
+    if G.num_nodes <= dense_limit:
+        return minimal_network(G)
+    return sparse_minimal_network(G)
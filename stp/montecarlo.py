@@ -0,0 +1,151 @@
+"""
+Monte Carlo view of a task chain with range durations: how long the day
+really takes, and how likely it is to run past the end hour.
+
+Durations are drawn a chunk of realisations at a time into a (samples,
+tasks) matrix and summed along the chain with one cumulative sum, so
+memory stays bounded by max_bytes however many realisations are asked for.
+"""
+
+import numpy as np
+
+from . import instrument
+from .chain import chain_bounds
+from .constraints import as_constraint_set
+
+
+def uniform_durations(rng, lower, upper, size):
+    """
+    Durations drawn uniformly from the whole hours lower..upper inclusive,
+    like the ranges parse_duration makes. Any sampler passed in place of
+    this one is called the same way and returns an array of shape size.
+    """
+    draws = rng.random(size, dtype=np.float32)
+    draws *= (upper - lower + 1).astype(np.float32)
+    durations = draws.astype(np.int32)
+    durations += lower
+    # float32 rounding can land on the value just past the range
+    return np.minimum(durations, upper, out=durations)
+
+
+def sample_start_times(
+    lower, upper, samples, sampler=None, seed=None, max_bytes=64 * 2**20
+):
+    """
+    Start times of x0..xn for samples realisations of the chain durations
+    lower[i]..upper[i] of the edges x{i} -> x{i + 1}, in hours from x0.
+
+    Yields (chunk, n + 1) arrays whose row r holds one realisation: task k
+    runs from column k - 1 to column k. Tasks with a fixed duration are not
+    sampled.
+    """
+    if sampler is None:
+        sampler = uniform_durations
+    rng = np.random.default_rng(seed)
+    lower = np.asarray(lower, dtype=np.int32)
+    upper = np.asarray(upper, dtype=np.int32)
+    varying = lower < upper
+    # Room for the raw draws, the durations and their sums
+    chunk = max(1, max_bytes // (16 * (len(lower) + 1)))
+
+    for start in range(0, samples, chunk):
+        rows = min(chunk, samples - start)
+        if varying.all():
+            durations = sampler(rng, lower, upper, (rows, len(lower)))
+        else:
+            drawn = sampler(rng, lower[varying], upper[varying], (rows, varying.sum()))
+            durations = np.empty((rows, len(lower)), dtype=drawn.dtype)
+            durations[:, ~varying] = lower[~varying]
+            durations[:, varying] = drawn
+        times = np.empty((rows, len(lower) + 1), dtype=durations.dtype)
+        times[:, 0] = 0
+        np.cumsum(durations, axis=1, out=times[:, 1:])
+        yield times
+
+
+class MakespanReport:
+    """
+    What simulate_makespan found over samples realisations of the day.
+
+    quantiles maps each requested probability to the makespan, in hours
+    from the start of the day, that that share of the days finish within.
+    miss_probability is the share of days that end after end_hour.
+    """
+
+    __slots__ = ("samples", "mean", "quantiles", "miss_probability", "total_hours")
+
+    def __init__(self, samples, mean, quantiles, miss_probability, total_hours):
+        self.samples = samples
+        self.mean = mean
+        self.quantiles = quantiles
+        self.miss_probability = miss_probability
+        self.total_hours = total_hours
+
+    def describe(self):
+        lines = [f"Mean length of the day: {self.mean:.2f} hour(s)"]
+        for q, hours in self.quantiles.items():
+            lines.append(f"{q:.0%} of days take at most {hours:g} hour(s)")
+        lines.append(
+            f"Chance of running past the {self.total_hours}-hour day: "
+            f"{self.miss_probability:.2%}"
+        )
+        return lines
+
+
+@instrument.timed("simulate_makespan")
+def simulate_makespan(
+    constraints,
+    num_tasks,
+    start_hour,
+    end_hour,
+    samples=100_000,
+    sampler=None,
+    quantiles=(0.5, 0.9, 0.95, 0.99),
+    seed=None,
+    max_bytes=64 * 2**20,
+):
+    """
+    Simulates the task chain of the constraints, day bound included, with
+    every range duration drawn by sampler (uniform by default, see
+    uniform_durations). Returns a MakespanReport.
+
+    Raises ValueError if the constraints are not a plain task chain.
+    """
+    if num_tasks == 1:
+        chain = _single_task_bounds(constraints)
+    else:
+        chain = chain_bounds(constraints, num_tasks)
+    if chain is None:
+        raise ValueError("only a plain task chain can be simulated")
+    lower, upper = chain[:2]
+    total_hours = end_hour - start_hour
+
+    makespans = np.empty(samples)
+    missed = 0
+    done = 0
+    for times in sample_start_times(lower, upper, samples, sampler, seed, max_bytes):
+        finish = times[:, -1]
+        makespans[done : done + len(finish)] = finish
+        missed += int(np.count_nonzero(finish > total_hours))
+        done += len(finish)
+
+    return MakespanReport(
+        samples,
+        float(makespans.mean()),
+        dict(zip(quantiles, np.quantile(makespans, quantiles).tolist())),
+        missed / samples,
+        total_hours,
+    )
+
+
+def _single_task_bounds(constraints):
+    """
+    (lower, upper) of a one-task schedule, or None if it has any constraint
+    other than x0 -> x1. chain_bounds cannot tell the task from the day
+    bound there, as both are on the same pair; the task is the first of
+    them and the day bound, if any, the last.
+    """
+    constraints = as_constraint_set(constraints)
+    if not len(constraints) or ((constraints.src != 0) | (constraints.dst != 1)).any():
+        return None
+    return constraints.lower[:1], constraints.upper[:1]
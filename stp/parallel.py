@@ -0,0 +1,173 @@
+"""
+Solves schedules made of independent groups of tasks one group at a time,
+in parallel.
+
+Groups that only meet at x0 cannot affect each other: a path from one to
+another has to pass through x0, so every shortest path, and every negative
+cycle, stays inside one group plus x0.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .core import solve_schedule
+from .graph import CompactGraph
+
+
+def components(G, reference=0):
+    """
+    Labels the weakly connected components of G once reference is removed.
+
+    Returns an array mapping each node id to the smallest node id in its
+    component; reference labels itself. Components are found by hooking
+    roots onto smaller roots over all edges at once and then jumping
+    pointers, so each round is a few whole-array operations.
+    """
+    outside = (G.src != reference) & (G.dst != reference)
+    u = G.src[outside]
+    v = G.dst[outside]
+    parent = np.arange(G.num_nodes)
+
+    while True:
+        pu = parent[u]
+        pv = parent[v]
+        differ = pu != pv
+        if not differ.any():
+            return parent
+        np.minimum.at(
+            parent,
+            np.maximum(pu[differ], pv[differ]),
+            np.minimum(pu[differ], pv[differ]),
+        )
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def solve_components(G, source=0, max_workers=None, method="bellman_ford"):
+    """
+    solve_schedule split over the components of G without source.
+
+    The edges are sorted by component into one shared-memory block, and
+    each worker process solves a run of whole components from its slice of
+    it. Runs are cut to hold roughly the same number of edges. With a
+    single component or a single worker everything is solved in this
+    process.
+
+    Returns (earliest, latest) arrays like solve_schedule, or (None, None)
+    if any component has a negative cycle.
+    """
+    label = components(G, source)
+
+    # Every edge belongs to the component of its end that is not source
+    owner = np.where(G.src == source, label[G.dst], label[G.src])
+    order = np.argsort(owner, kind="stable")
+    owner = owner[order]
+    cuts = np.flatnonzero(np.diff(owner)) + 1
+    starts = np.concatenate(([0], cuts))
+    stops = np.concatenate((cuts, [len(owner)]))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    runs = _runs(starts, stops, max_workers)
+
+    earliest = np.full(G.num_nodes, -np.inf)
+    latest = np.full(G.num_nodes, np.inf)
+    earliest[source] = 0
+    latest[source] = 0
+
+    if len(runs) <= 1:
+        edges = np.stack((G.src, G.dst, G.weight))[:, order]
+        results = [_solve_run(edges, starts, stops, source, method)]
+    else:
+        results = _solve_parallel(G, order, runs, source, method)
+
+    for result in results:
+        if result is None:
+            return None, None
+        for nodes, component_earliest, component_latest in result:
+            earliest[nodes] = component_earliest
+            latest[nodes] = component_latest
+    return earliest, latest
+
+
+def _runs(starts, stops, workers):
+    """Groups consecutive components into at most workers runs of similar
+    edge counts, as lists of (start, stop) slices."""
+    if len(starts) == 0:
+        return []
+    target = stops[-1] / workers
+    runs = [[]]
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        if runs[-1] and start >= target * len(runs):
+            runs.append([])
+        runs[-1].append((start, stop))
+    return runs
+
+
+def _solve_parallel(G, order, runs, source, method):
+    num_edges = len(order)
+    block = shared_memory.SharedMemory(create=True, size=max(3 * num_edges * 8, 1))
+    try:
+        edges = np.ndarray((3, num_edges), dtype=np.int64, buffer=block.buf)
+        edges[0] = G.src[order]
+        edges[1] = G.dst[order]
+        edges[2] = G.weight[order]
+        del edges
+
+        with ProcessPoolExecutor(max_workers=len(runs)) as pool:
+            futures = [
+                pool.submit(_solve_shared, block.name, num_edges, run, source, method)
+                for run in runs
+            ]
+            return [future.result() for future in futures]
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _solve_shared(name, num_edges, run, source, method):
+    """Worker: attaches to the edge block and solves its run."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        edges = np.ndarray((3, num_edges), dtype=np.int64, buffer=block.buf)
+        start, stop = run[0][0], run[-1][1]
+        # Copied out so the block can be closed before solving
+        edges = edges[:, start:stop].copy()
+    finally:
+        block.close()
+
+    starts = np.array([s for s, _ in run]) - start
+    stops = np.array([s for _, s in run]) - start
+    return _solve_run(edges, starts, stops, source, method)
+
+
+def _solve_run(edges, starts, stops, source, method):
+    """
+    Solves each component whose edges are edges[:, start:stop], with its
+    nodes renumbered from 0 so its graph is only as large as it is.
+    Returns a list of (nodes, earliest, latest), or None as soon as one
+    component is infeasible.
+    """
+    results = []
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        src, dst, weight = edges[:, start:stop]
+        nodes = np.unique(np.concatenate(([source], src, dst)))
+        local = CompactGraph(
+            len(nodes),
+            np.searchsorted(nodes, src),
+            np.searchsorted(nodes, dst),
+            weight,
+        )
+        earliest, latest = solve_schedule(
+            local, int(np.searchsorted(nodes, source)), method
+        )
+        if earliest is None:
+            return None
+        results.append((nodes, earliest, latest))
+    return results
@@ -0,0 +1,397 @@
+"""
+Schedules whose range durations are not ours to choose, only to observe:
+simple temporal networks with uncertainty (STNUs).
+
+A contingent link A => C says that once x{A} has run, x{C} happens on its
+own somewhere in [A + lower, A + upper]. Such a network is dynamically
+controllable if the other time points can always be run in time by only
+reacting to what has been observed so far. dynamic_controllability checks
+this with Morris's DCbackprop (2014), which is O(n^3) in the worst case and
+close to linear on task chains, and returns an ExecutionStrategy that runs
+the schedule.
+"""
+
+import heapq
+
+import numpy as np
+
+from . import instrument
+from .constraints import as_constraint_set
+from .core import build_graph
+from .engine import spfa
+
+_ACTIVE = 1
+_DONE = 2
+
+
+def contingent_durations(constraints):
+    """
+    Mask of the task durations entered as ranges: (i, i + 1) constraints
+    with lower < upper that no later constraint on the same pair overrides.
+    """
+    constraints = as_constraint_set(constraints)
+    return (
+        _last_of_pair(constraints)
+        & (constraints.dst == constraints.src + 1)
+        & (constraints.lower < constraints.upper)
+    )
+
+
+def _last_of_pair(constraints):
+    """Mask of the constraints no later one on the same pair overrides."""
+    src, dst = constraints.src, constraints.dst
+    mask = np.zeros(len(src), dtype=bool)
+    if len(src):
+        keys = src * (int(dst.max()) + 1) + dst
+        _, last = np.unique(keys[::-1], return_index=True)
+        mask[len(keys) - 1 - last] = True
+    return mask
+
+
+class STNU:
+    """
+    Labelled distance graph of an STNU.
+
+    incoming[v] maps u to w for every ordinary edge u -> v, i.e.
+    t(v) - t(u) <= w, keyed by target because DCbackprop walks edges
+    backwards. links maps each contingent time point C to (A, lower, upper);
+    its lower-case edge A -> C and upper-case edge C -> A are implied by the
+    link rather than stored.
+    """
+
+    __slots__ = ("num_nodes", "incoming", "links")
+
+    def __init__(self, num_nodes, incoming, links):
+        self.num_nodes = num_nodes
+        self.incoming = incoming
+        self.links = links
+
+    def copy(self):
+        return STNU(
+            self.num_nodes, [dict(edges) for edges in self.incoming], dict(self.links)
+        )
+
+    def edges(self):
+        """Every ordinary edge as (u, v, w)."""
+        for v, edges in enumerate(self.incoming):
+            for u, w in edges.items():
+                yield u, v, w
+
+    def number_of_edges(self):
+        return sum(len(edges) for edges in self.incoming)
+
+
+def build_stnu(constraints, num_tasks, start_hour, end_hour, contingent=None):
+    """
+    The graph build_graph makes from the constraints, with the constraints
+    flagged in the contingent mask turned into contingent links. By default
+    those are the range durations, see contingent_durations.
+
+    Raises ValueError if a flagged constraint is not a proper range, is
+    overridden by a later one on the same pair, ends at x0, or ends where
+    another contingent link already does.
+    """
+    constraints = as_constraint_set(constraints)
+    if contingent is None:
+        contingent = contingent_durations(constraints)
+    contingent = np.asarray(contingent, dtype=bool)
+
+    G = build_graph(constraints, num_tasks, start_hour, end_hour)
+    incoming = [{} for _ in range(G.num_nodes)]
+    for u, v, w in G.edges():
+        if u != v:
+            incoming[v][u] = w
+
+    last = _last_of_pair(constraints)
+    links = {}
+    for k in np.flatnonzero(contingent).tolist():
+        a, c = int(constraints.src[k]), int(constraints.dst[k])
+        lower, upper = int(constraints.lower[k]), int(constraints.upper[k])
+        if not 0 <= lower < upper:
+            raise ValueError(f"x{a} => x{c} needs 0 <= lower < upper to be contingent")
+        if not last[k]:
+            raise ValueError(f"x{a} => x{c} is overridden by a later constraint")
+        if c == 0 or c in links:
+            raise ValueError(f"x{c} cannot end more than one contingent link")
+        links[c] = (a, lower, upper)
+
+    return STNU(G.num_nodes, incoming, links)
+
+
+@instrument.timed("dynamic_controllability")
+def dynamic_controllability(stnu):
+    """
+    Checks whether stnu is dynamically controllable with Morris's DCbackprop.
+
+    Every negative edge into a node is propagated backwards, Dijkstra-style,
+    until each path either turns non-negative, which adds an ordinary edge
+    back to the node, or reaches another node with negative in-edges, which
+    is processed first and from then on only needs its non-negative
+    in-edges. A lower-case edge may not extend a path that started with the
+    upper-case edge of its own link. Meeting a node that is still being
+    processed further up means a negative cycle that no strategy can avoid.
+
+    Returns an ExecutionStrategy over a copy of stnu with the added edges,
+    or None if it is not dynamically controllable.
+    """
+    stnu = stnu.copy()
+    upper_case = [[] for _ in range(stnu.num_nodes)]
+    for c, (a, _, upper) in stnu.links.items():
+        upper_case[a].append((c, -upper))
+
+    # Added edges are never negative, so the nodes with negative in-edges
+    # are known up front
+    negative = [
+        bool(upper_case[v]) or any(w < 0 for w in stnu.incoming[v].values())
+        for v in range(stnu.num_nodes)
+    ]
+    status = [0] * stnu.num_nodes
+    for node in range(stnu.num_nodes):
+        if negative[node] and not status[node]:
+            if not _backprop(stnu, upper_case, negative, status, node):
+                return None
+    return ExecutionStrategy(stnu)
+
+
+def _backprop(stnu, upper_case, negative, status, start):
+    """DCbackprop from start, with the recursion kept on an explicit stack so
+    long task chains do not hit Python's recursion limit."""
+    status[start] = _ACTIVE
+    stack = [_Backprop(stnu, upper_case, start)]
+    while stack:
+        call = stack[-1].run(stnu, negative, status)
+        if call is False:
+            return False
+        if call is None:
+            status[stack.pop().source] = _DONE
+            continue
+        if status[call] == _ACTIVE:
+            return False
+        status[call] = _ACTIVE
+        stack.append(_Backprop(stnu, upper_case, call))
+    return True
+
+
+class _Backprop:
+    """
+    One DCbackprop call: a Dijkstra over reversed edges from source.
+
+    Paths are kept apart by how they start: label -1 for an ordinary edge,
+    or the contingent time point C whose upper-case edge starts them. A
+    C-labelled path only loses its label once it is no shorter than minus
+    the lower bound of C's link, so a node keeps one distance per label.
+    """
+
+    __slots__ = ("source", "distance", "heap", "settled", "pending")
+
+    def __init__(self, stnu, upper_case, source):
+        self.source = source
+        self.distance = {}
+        self.heap = []
+        self.settled = set()
+        self.pending = None
+        for u, w in stnu.incoming[source].items():
+            if w < 0:
+                self._push(stnu, u, w, -1)
+        for c, w in upper_case[source]:
+            self._push(stnu, c, w, c)
+
+    def _push(self, stnu, node, distance, label):
+        if label >= 0 and distance >= -stnu.links[label][1]:
+            label = -1
+        state = (node, label)
+        if state in self.settled:
+            return
+        if distance < self.distance.get(state, float("inf")):
+            self.distance[state] = distance
+            heapq.heappush(self.heap, (distance, label, node))
+
+    def run(self, stnu, negative, status):
+        """
+        Continues the search. Returns a node that has to be processed before
+        the search can go on, False on a negative cycle, or None once done.
+        """
+        if self.pending is not None:
+            self._extend(stnu, *self.pending)
+            self.pending = None
+
+        while self.heap:
+            distance, label, u = heapq.heappop(self.heap)
+            state = (u, label)
+            if state in self.settled or distance != self.distance[state]:
+                continue
+            self.settled.add(state)
+            if label >= 0 and (u, -1) in self.settled:
+                # An ordinary path at least as short got here first
+                continue
+
+            if u == self.source:
+                if distance < 0:
+                    return False
+                continue
+            if distance >= 0:
+                # The path reduces to an ordinary edge back to source
+                edges = stnu.incoming[self.source]
+                edges[u] = min(edges.get(u, distance), distance)
+                continue
+
+            if negative[u] and status[u] != _DONE:
+                self.pending = (u, distance, label)
+                return u
+            self._extend(stnu, u, distance, label)
+        return None
+
+    def _extend(self, stnu, u, distance, label):
+        # u's negative in-edges are already folded into non-negative ones
+        for p, w in stnu.incoming[u].items():
+            if w >= 0:
+                self._push(stnu, p, distance + w, label)
+        link = stnu.links.get(u)
+        if link is not None and label != u:
+            self._push(stnu, link[0], distance + link[1], label)
+
+
+class ExecutionStrategy:
+    """
+    Runs a dynamically controllable STNU as time goes by.
+
+    x0 runs at time 0. record(node, t) reports that a time point happened:
+    a contingent one when it is observed, any other when it was run.
+    next_step() says when the next time points under our control should run
+    and which: as early as the constraints allow, treating every contingent
+    time point still pending as if it will take its full duration. If a
+    contingent time point is observed before then, record it and ask again.
+    """
+
+    __slots__ = (
+        "stnu",
+        "times",
+        "now",
+        "_src",
+        "_dst",
+        "_weight",
+        "_earliest",
+        "_controlled",
+    )
+
+    def __init__(self, stnu):
+        self.stnu = stnu
+        self.times = {0: 0}
+        self.now = 0
+        edges = list(stnu.edges())
+        self._src = np.array([u for u, _, _ in edges], dtype=np.int64)
+        self._dst = np.array([v for _, v, _ in edges], dtype=np.int64)
+        self._weight = np.array([w for _, _, w in edges], dtype=np.int64)
+        self._earliest = None
+        # Time points still to be run by us
+        self._controlled = np.ones(stnu.num_nodes, dtype=bool)
+        self._controlled[0] = False
+        self._controlled[list(stnu.links)] = False
+
+    def record(self, node, t):
+        if node in self.times:
+            raise ValueError(f"x{node} has already happened")
+        if t < self.now:
+            raise ValueError(f"x{node} cannot happen before time {self.now}")
+        earliest = self.earliest()[node]
+        if node not in self.stnu.links and t < earliest:
+            raise ValueError(f"x{node} cannot run before time {_as_time(earliest)}")
+        self.times[node] = t
+        self.now = t
+        self._controlled[node] = False
+        # Happening exactly when expected adds no shorter path, so the
+        # bounds only need solving again after a surprise
+        if t != earliest:
+            self._earliest = None
+
+    def earliest(self):
+        """
+        Earliest time each time point can happen given what has happened so
+        far, with pending contingent time points at their full duration.
+        """
+        if self._earliest is None:
+            self._earliest = self._solve()
+        return self._earliest
+
+    def _solve(self):
+        links = self.stnu.links
+        pinned = list(self.times.items())
+        pending = [(c, link) for c, link in links.items() if c not in self.times]
+        src = np.concatenate(
+            (
+                self._src,
+                [node for node, _ in pinned],
+                [c for c, _ in pending],
+            )
+        ).astype(np.int64)
+        dst = np.concatenate(
+            (self._dst, np.zeros(len(pinned)), [a for _, (a, _, _) in pending])
+        ).astype(np.int64)
+        weight = np.concatenate(
+            (
+                self._weight,
+                [-t for _, t in pinned],
+                [-upper for _, (_, _, upper) in pending],
+            )
+        ).astype(np.int64)
+
+        # Distances to x0, found by walking the edges backwards from it
+        order = np.argsort(dst, kind="stable")
+        indptr = np.zeros(self.stnu.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=self.stnu.num_nodes), out=indptr[1:])
+        distances, _, witness = spfa(self.stnu.num_nodes, indptr, src, weight, 0, order)
+        if witness >= 0:
+            raise ValueError("what has happened leaves no way to finish in time")
+        return -distances
+
+    def next_step(self):
+        """
+        (t, nodes): the time points under our control that should run at
+        time t, or None once they all have. Run one of them, record it and
+        ask again.
+        """
+        waiting = np.flatnonzero(self._controlled)
+        if not len(waiting):
+            return None
+        earliest = np.maximum(self.earliest()[waiting], self.now)
+        t = earliest.min()
+        return _as_time(t), waiting[earliest == t].tolist()
+
+    def simulate(self, durations):
+        """
+        Runs the whole schedule against the given contingent durations,
+        a mapping from each contingent time point to how long after its
+        activation it happens. Returns the time of every time point.
+        """
+        activates = {}
+        for c, (a, _, _) in self.stnu.links.items():
+            activates.setdefault(a, []).append(c)
+        due = []
+
+        def happen(node, t):
+            self.record(node, t)
+            for c in activates.get(node, ()):
+                heapq.heappush(due, (t + durations[c], c))
+
+        for node, t in list(self.times.items()):
+            for c in activates.get(node, ()):
+                if c not in self.times:
+                    heapq.heappush(due, (t + durations[c], c))
+        while True:
+            step = self.next_step()
+            # An observation at the same time as a decision is seen first
+            if due and (step is None or due[0][0] <= step[0]):
+                t, c = heapq.heappop(due)
+                happen(c, t)
+            elif step is not None:
+                t, nodes = step
+                happen(nodes[0], t)
+            else:
+                break
+        return np.array(
+            [self.times.get(node, np.nan) for node in range(self.stnu.num_nodes)]
+        )
+
+
+def _as_time(value):
+    return int(value) if np.isfinite(value) else float(value)
@@ -0,0 +1,196 @@
+"""
+Ways of re-anchoring the schedule after the user moves a task.
+
+Each strategy rewrites the constraints for the edit and says which part of
+them to solve again, from which node, and how solved nodes map back to task
+numbers and clock hours. The interactive loop in app.main is otherwise the
+same for all of them.
+"""
+
+from abc import ABC, abstractmethod
+
+from .constraints import ConstraintSet
+from .core import convert_to_24_hour_format
+
+
+class UpdateStrategy(ABC):
+    """
+    Base class for re-anchoring strategies. Subclasses implement
+    adjust_constraints and sub_schedule.
+
+    reanchors says whether the edited task becomes x0 of the new
+    constraints. When it does, later edits are passed in task numbers
+    relative to that task.
+    """
+
+    reanchors = False
+
+    @abstractmethod
+    def adjust_constraints(
+        self,
+        constraints,
+        task_to_change,
+        new_start_time,
+        num_tasks,
+        start_hour,
+        end_hour,
+    ):
+        """The constraints after task_to_change moves to new_start_time."""
+
+    @abstractmethod
+    def sub_schedule(self, constraints, task_to_change, num_tasks):
+        """
+        (constraints, num_tasks, source) of the graph to solve again, with
+        num_tasks 0 when no task is left to solve.
+        """
+
+    def anchor_hour(self, start_hour, new_start_time):
+        """Clock hour that solved times are offsets from."""
+        return start_hour
+
+
+class KeepIndices(UpdateStrategy):
+    """
+    Task numbers stay fixed; the constraint into the moved task is pinned to
+    the new start time and the schedule is solved again from the task before
+    it (final.py).
+    """
+
+    def adjust_constraints(
+        self,
+        constraints,
+        task_to_change,
+        new_start_time,
+        num_tasks,
+        start_hour,
+        end_hour,
+    ):
+        """
+        Adjusts the constraints when a task's start time is changed by the user.
+        Only the constraints for the tasks that come after the fixed task are updated.
+        """
+
+        new_start_hour = convert_to_24_hour_format(new_start_time) - start_hour
+        new_constraints = ConstraintSet(constraints)
+
+        # The constraints leaving the task before the changed one pin its start
+        pinned = new_constraints.src == task_to_change - 1
+        new_constraints.lower[pinned] = new_start_hour
+        new_constraints.upper[pinned] = new_start_hour
+
+        # This adds the global constraint back into the constraints list
+        new_constraints.append((0, num_tasks, range(0, end_hour - start_hour + 1)))
+
+        return new_constraints
+
+    def sub_schedule(self, constraints, task_to_change, num_tasks):
+        updated_task_index = task_to_change - 1
+        return (
+            constraints[updated_task_index:],
+            num_tasks - updated_task_index,
+            updated_task_index,
+        )
+
+
+class ShiftToTask(UpdateStrategy):
+    """
+    The moved task becomes the new x0, at its new start time, and the tasks
+    after it are renumbered from 1 and bounded by the hours left between the
+    new start time and the end of the day (messi.py).
+    """
+
+    reanchors = True
+
+    def adjust_constraints(
+        self,
+        constraints,
+        task_to_change,
+        new_start_time,
+        num_tasks,
+        start_hour,
+        end_hour,
+    ):
+        """
+        Adjusts the constraints when a task's start time is changed.
+        The task that is updated becomes the new 'x0', and subsequent tasks are renumbered.
+        Raises ValueError if the new start time is after the end of the day.
+        """
+        new_start_hour = convert_to_24_hour_format(new_start_time)
+        new_constraints = ConstraintSet()
+
+        # Bound the remaining tasks by the rest of the day; it goes first so
+        # a constraint of their own on the same pair overrides it. Moving the
+        # last task leaves nothing to bound
+        remaining_hours = end_hour - new_start_hour
+        if remaining_hours < 0:
+            raise ValueError("the new start time is after the end of the day")
+        if num_tasks > task_to_change:
+            new_constraints.append(
+                (0, num_tasks - task_to_change, range(0, remaining_hours + 1))
+            )
+
+        # Renumber the constraints between the tasks after the updated one
+        constraints = ConstraintSet(constraints)
+        kept = (constraints.src >= task_to_change) & (constraints.dst > task_to_change)
+        new_constraints.extend_arrays(
+            constraints.src[kept] - task_to_change,
+            constraints.dst[kept] - task_to_change,
+            constraints.lower[kept],
+            constraints.upper[kept],
+        )
+
+        return new_constraints
+
+    def sub_schedule(self, constraints, task_to_change, num_tasks):
+        return constraints, num_tasks - task_to_change, 0
+
+    def anchor_hour(self, start_hour, new_start_time):
+        """The new x0 is the moved task, at its new start time."""
+        return convert_to_24_hour_format(new_start_time)
+
+
+class ShiftToHour(ShiftToTask):
+    """
+    Like ShiftToTask, but every constraint leaving the moved task or a later
+    one is kept (test.py).
+    """
+
+    def adjust_constraints(
+        self,
+        constraints,
+        task_to_change,
+        new_start_time,
+        num_tasks,
+        start_hour,
+        end_hour,
+    ):
+        new_start_hour = convert_to_24_hour_format(new_start_time)
+        new_constraints = ConstraintSet()
+
+        # Adjust the global constraint for the end of the day based on the new start time
+        remaining_hours = end_hour - new_start_hour
+        if remaining_hours < 0:
+            raise ValueError("the new start time is after the end of the day")
+        if num_tasks > task_to_change:
+            new_constraints.append(
+                (0, num_tasks - task_to_change, range(0, remaining_hours + 1))
+            )
+
+        # Adjust constraints for the remaining tasks relative to the updated task
+        constraints = ConstraintSet(constraints)
+        kept = constraints.src >= task_to_change
+        new_constraints.extend_arrays(
+            constraints.src[kept] - task_to_change,
+            constraints.dst[kept] - task_to_change,
+            constraints.lower[kept],
+            constraints.upper[kept],
+        )
+
+        return new_constraints
+
+
+STRATEGIES = {
+    "final": KeepIndices,
+    "messi": ShiftToTask,
+    "test": ShiftToHour,
+}